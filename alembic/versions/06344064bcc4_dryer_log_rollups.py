@@ -0,0 +1,85 @@
+"""dryer_log_rollups
+
+Revision ID: 06344064bcc4
+Revises: 9b8173fa40f7
+Create Date: 2026-10-16 23:41:37.502911
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '06344064bcc4'
+down_revision = '9b8173fa40f7'
+branch_labels = None
+depends_on = None
+
+# Bucket widths (seconds) kept in dryer_log_rollups, see api/cruds/rollup_crud.py
+RESOLUTIONS = (60, 900, 3600)
+
+
+def upgrade():
+    op.create_table('dryer_log_rollups',
+    sa.Column('dryer_id', sa.Integer(), nullable=False),
+    sa.Column('resolution', sa.Integer(), nullable=False),
+    sa.Column('bucket', sa.DateTime(), nullable=False),
+    sa.Column('samples', sa.Integer(), nullable=True),
+    sa.Column('last_timestamp', sa.DateTime(), nullable=True),
+    sa.Column('status', sa.String(length=25), nullable=True),
+    sa.Column('current_preset_id', sa.Integer(), nullable=True),
+    sa.Column('time_left_drying', sa.Integer(), nullable=True),
+    sa.Column('temperature_min', sa.Float(), nullable=True),
+    sa.Column('temperature_max', sa.Float(), nullable=True),
+    sa.Column('temperature_mean', sa.Float(), nullable=True),
+    sa.Column('relative_humidity_min', sa.Float(), nullable=True),
+    sa.Column('relative_humidity_max', sa.Float(), nullable=True),
+    sa.Column('relative_humidity_mean', sa.Float(), nullable=True),
+    sa.Column('absolute_humidity_mean', sa.Float(), nullable=True),
+    sa.Column('heater_temperature_mean', sa.Float(), nullable=True),
+    sa.Column('heater_duty', sa.Float(), nullable=True),
+    sa.Column('heater_fan_duty', sa.Float(), nullable=True),
+    sa.Column('servo_open_fraction', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['dryer_id'], ['dryers.id'], ),
+    sa.PrimaryKeyConstraint('dryer_id', 'resolution', 'bucket')
+    )
+    op.create_index('ix_dryer_log_rollups_resolution_bucket', 'dryer_log_rollups', ['resolution', 'bucket'], unique=False)
+
+    # Backfill from existing raw logs; status / preset / time left come from
+    # the latest row of each bucket (rn = 1).
+    for resolution in RESOLUTIONS:
+        op.execute(f"""
+            INSERT INTO dryer_log_rollups (
+                dryer_id, resolution, bucket, samples, last_timestamp, status,
+                current_preset_id, time_left_drying,
+                temperature_min, temperature_max, temperature_mean,
+                relative_humidity_min, relative_humidity_max, relative_humidity_mean,
+                absolute_humidity_mean, heater_temperature_mean,
+                heater_duty, heater_fan_duty, servo_open_fraction)
+            WITH slotted AS (
+                SELECT *,
+                    CAST(strftime('%s', timestamp) AS INTEGER) / {resolution} AS slot,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY dryer_id, CAST(strftime('%s', timestamp) AS INTEGER) / {resolution}
+                        ORDER BY timestamp DESC, id DESC
+                    ) AS rn
+                FROM dryer_logs
+                WHERE dryer_id IS NOT NULL AND timestamp IS NOT NULL
+            )
+            SELECT
+                dryer_id, {resolution}, datetime(slot * {resolution}, 'unixepoch') || '.000000',
+                count(*), max(timestamp),
+                max(CASE WHEN rn = 1 THEN status END),
+                max(CASE WHEN rn = 1 THEN current_preset_id END),
+                max(CASE WHEN rn = 1 THEN time_left_drying END),
+                min(temperature), max(temperature), avg(temperature),
+                min(relative_humidity), max(relative_humidity), avg(relative_humidity),
+                avg(absolute_humidity), avg(heater_temperature),
+                avg(heater_is_on), avg(heater_fan_is_run), avg(servo_is_open)
+            FROM slotted
+            GROUP BY dryer_id, slot
+        """)
+
+def downgrade():
+    op.drop_index('ix_dryer_log_rollups_resolution_bucket', table_name='dryer_log_rollups')
+    op.drop_table('dryer_log_rollups')
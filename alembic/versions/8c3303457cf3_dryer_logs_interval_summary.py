@@ -0,0 +1,35 @@
+"""dryer_logs interval summary
+
+Revision ID: 8c3303457cf3
+Revises: 06344064bcc4
+Create Date: 2026-10-17 00:12:08.640317
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c3303457cf3'
+down_revision = '06344064bcc4'
+branch_labels = None
+depends_on = None
+
+SUMMARY_COLUMNS = (
+    'temperature_min', 'temperature_max', 'temperature_mean',
+    'relative_humidity_min', 'relative_humidity_max', 'relative_humidity_mean',
+    'heater_temperature_min', 'heater_temperature_max', 'heater_temperature_mean',
+)
+
+
+def upgrade():
+    op.add_column('dryer_logs', sa.Column('samples', sa.Integer(), nullable=True))
+    for name in SUMMARY_COLUMNS:
+        op.add_column('dryer_logs', sa.Column(name, sa.Float(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('dryer_logs') as batch_op:
+        for name in reversed(SUMMARY_COLUMNS):
+            batch_op.drop_column(name)
+        batch_op.drop_column('samples')
@@ -0,0 +1,28 @@
+"""dryer_logs indexes
+
+Revision ID: 9b8173fa40f7
+Revises: 5a91b07ca6c5
+Create Date: 2026-10-16 23:05:12.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b8173fa40f7'
+down_revision = '5a91b07ca6c5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Per-dryer history reads: equality on dryer_id, range + ORDER BY on timestamp
+    op.create_index('ix_dryer_logs_dryer_id_timestamp', 'dryer_logs', ['dryer_id', 'timestamp'], unique=False)
+    # All-dryer history reads ordered by time
+    op.create_index('ix_dryer_logs_timestamp', 'dryer_logs', ['timestamp'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_dryer_logs_timestamp', table_name='dryer_logs')
+    op.drop_index('ix_dryer_logs_dryer_id_timestamp', table_name='dryer_logs')
@@ -0,0 +1,16 @@
+"""Sampling timing shared by the control loop and the telemetry pipeline.
+
+Read once here so the status worker, the telemetry recorder / buffer and the
+history resolution picker always agree on the same periods.
+"""
+
+import os
+
+# Control loop tick (seconds); the densest rate a dryer is sampled at
+STATUS_TICK_PERIOD = float(os.getenv("STATUS_TICK_PERIOD", "1"))
+# >0: one summary row is stored per interval (seconds) instead of per sample
+TELEMETRY_PERSIST_INTERVAL = float(os.getenv("TELEMETRY_PERSIST_INTERVAL", "0"))
+# Seconds the status worker waits for a dryer tick, and the bound on a dryer's own Moonraker status read
+DRYER_UPDATE_DEADLINE = float(os.getenv("DRYER_UPDATE_DEADLINE", "5"))
+# Densest rate rows are stored / broadcast at
+RAW_SAMPLE_PERIOD = TELEMETRY_PERSIST_INTERVAL if TELEMETRY_PERSIST_INTERVAL > 0 else STATUS_TICK_PERIOD
@@ -1,3 +1,4 @@
+from datetime import datetime
 from sqlalchemy import select, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.schemas import dryer_schema as dryerSchema
@@ -6,6 +7,7 @@ from api import models
 from typing import List
 from sqlalchemy.orm import selectinload
 from api.logger import get_logger
+from api.cruds.config_cache import config_cache, MISSING
 
 logger = get_logger("common_crud")
 
@@ -28,6 +30,15 @@ class CommonCRUD:
         logger.debug("get_units done count=%s", len(dryers))
         return dryers
 
+    async def get_units_cached(self, db: AsyncSession) -> List[models.Dryer]:
+        """`get_units` served from the config cache (reloaded after dryer writes)."""
+        units = config_cache.get(("units",))
+        if units is MISSING:
+            version = config_cache.version
+            units = await self.get_units(db)
+            config_cache.set(("units",), units, version)
+        return units
+
     async def get_presets(self, db: AsyncSession) -> List[models.Preset]:
         """Return list of presets with linked dryers eager-loaded.
 
@@ -47,7 +58,7 @@ class CommonCRUD:
         return presets
 
     async def clear_logs(self, db: AsyncSession) -> bool:
-        """Delete all dryer logs.
+        """Delete all dryer logs and their rollups.
 
         Returns True if any rows were deleted, False otherwise.
         Errors are caught and logged; on failure returns False.
@@ -56,6 +67,7 @@ class CommonCRUD:
         try:
             stmt = delete(models.DryerLogs)
             result = await db.execute(stmt)
+            await db.execute(delete(models.DryerLogRollup))
             await db.commit()
             deleted_count = result.rowcount or 0
             logger.info("clear_logs success deleted=%s", deleted_count)
@@ -65,4 +77,20 @@ class CommonCRUD:
             logger.exception("clear_logs failed")
             return False
 
+    async def delete_logs_before(self, db: AsyncSession, cutoff: datetime, limit: int) -> int:
+        """Delete up to `limit` of the oldest raw logs older than `cutoff`.
+
+        The chunk is picked through ix_dryer_logs_timestamp and committed on its
+        own, so the write lock is held only briefly. Returns rows deleted.
+        """
+        chunk = (
+            select(models.DryerLogs.id)
+            .where(models.DryerLogs.timestamp < cutoff)
+            .order_by(models.DryerLogs.timestamp)
+            .limit(limit)
+        )
+        result = await db.execute(delete(models.DryerLogs).where(models.DryerLogs.id.in_(chunk)))
+        await db.commit()
+        return result.rowcount or 0
+
 common_crud = CommonCRUD()
\ No newline at end of file
@@ -0,0 +1,51 @@
+"""In-process cache for rarely changing configuration rows.
+
+Holds the dryer list, presets and preset links read by the control loop.
+Every CRUD write path touching those tables calls `config_cache.invalidate()`,
+which drops all entries and bumps `version`; runtime objects compare the
+version they last saw with the current one (O(1)) to know when to reload.
+"""
+
+from typing import Any, Hashable
+from api.logger import get_logger
+
+logger = get_logger("config_cache")
+
+# Sentinel for "not cached" (None is a valid cached value, e.g. a missing preset)
+MISSING = object()
+
+
+class ConfigCache:
+    """Versioned key/value store filled by the `*_cached` CRUD readers."""
+
+    def __init__(self):
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: dict[Hashable, Any] = {}
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value for `key` or `MISSING`."""
+        value = self._entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, version: int) -> None:
+        """Store `value` unless the cache was invalidated since `version` was read."""
+        if version == self.version:
+            self._entries[key] = value
+
+    def invalidate(self, reason: str = "") -> None:
+        """Drop all entries and bump the version."""
+        self._entries.clear()
+        self.version += 1
+        logger.debug("config cache invalidated version=%s reason=%s", self.version, reason)
+
+    def stats(self) -> dict:
+        return {"version": self.version, "entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+config_cache = ConfigCache()
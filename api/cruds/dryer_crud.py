@@ -1,13 +1,38 @@
-from sqlalchemy import select
+from datetime import datetime, timezone
+from sqlalchemy import select, insert, func, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from api import models
 from api.schemas import dryer_schema as schema
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List, Sequence, Tuple
 from api.logger import get_logger
+from api.cruds.config_cache import config_cache
+from api.database import get_db
+from api.cruds.rollup_crud import rollup_crud, pick_resolution
+from api.tools.telemetry_recorder import TELEMETRY_RECORD_MODE, step_hold
+from api.tools.log_rows import Log_rows, LOG_COLUMNS, LOG_KEY
 
 logger = get_logger("dryer_crud")
 
+
+def _parse_time(value: str) -> datetime:
+    """Parse an ISO timestamp into the naive UTC form stored in dryer_logs.
+
+    Timestamps are stored as naive UTC text, so offsets are normalised first;
+    the bound value then compares directly against the indexed column.
+    """
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+async def chunked(logs, size: int) -> AsyncIterator:
+    """Yield already loaded history (a list or `Log_rows`) in chunks of `size` (async, like `stream_log_rows`)."""
+    for i in range(0, len(logs), size):
+        yield logs[i:i + size]
+
+
 class DryerCRUD:
     """CRUD operations for Dryer entities and related logs.
 
@@ -72,6 +97,7 @@ class DryerCRUD:
 
 
         await db.commit()
+        config_cache.invalidate("create_dryer_config")
         result = await db.execute(
             select(models.Dryer)
             .options(selectinload(models.Dryer.servo), selectinload(models.Dryer.heater), selectinload(models.Dryer.humidity),
@@ -133,6 +159,7 @@ class DryerCRUD:
             for key, value in config_data.servo.dict(exclude_unset=True).items():
                 setattr(db_dryer.servo, key, value)
         await db.commit()
+        config_cache.invalidate("update_dryer_config")
         await db.refresh(db_dryer)
         logger.info("update_dryer_config success id=%s", dryer_id)
         return schema.Dryer.from_orm(db_dryer)
@@ -147,6 +174,7 @@ class DryerCRUD:
         if db_dryer:
             await db.delete(db_dryer)
             await db.commit()
+            config_cache.invalidate("delete_dryer")
             logger.info("delete_dryer success id=%s", dryer_id)
             return True
         logger.warning("delete_dryer not_found id=%s", dryer_id)
@@ -156,14 +184,45 @@ class DryerCRUD:
         """Insert a dryer log entry and return created schema."""
         db_log = models.DryerLogs(**log_data.dict())
         db.add(db_log)
+        await rollup_crud.add_logs(db, [log_data])
         await db.commit()
         await db.refresh(db_log)
         return schema.DryerLog.from_orm(db_log) if db_log else None
 
+    async def add_logs(self, db: AsyncSession, logs: list[schema.DryerLog],
+                       samples: Optional[list[schema.DryerLog]] = None) -> int:
+        """Bulk insert log records (ids assigned by the caller) in one transaction.
+
+        Uses a single executemany INSERT and folds `samples` (default: `logs`;
+        a superset under change-only recording) into the rollup buckets before
+        the commit; returns the number of rows written.
+        """
+        samples = logs if samples is None else samples
+        if not samples:
+            return 0
+        if logs:
+            await db.execute(insert(models.DryerLogs), [log.dict() for log in logs])
+        await rollup_crud.add_logs(db, samples)
+        await db.commit()
+        return len(logs)
+
+    async def get_max_log_id(self, db: AsyncSession) -> int:
+        """Return the highest dryer_logs id (0 when the table is empty)."""
+        result = await db.execute(select(func.max(models.DryerLogs.id)))
+        return result.scalar() or 0
+
     async def get_logs(self, db: AsyncSession, dryer_id: Optional[int] = None, 
                        start_time: Optional[str] = None, end_time: Optional[str] = None,
                        limit: Optional[int] = None) -> list[models.DryerLogs]:
         """Return dryer logs with optional filtering.
+
+        The statement is shaped for the dryer_logs indexes: equality on dryer_id
+        plus a timestamp range ordered by (timestamp, id) is served by
+        ix_dryer_logs_dryer_id_timestamp (ix_dryer_logs_timestamp without a
+        dryer) with no sort step, and LIMIT stops the index walk early.
+
+        Under change-only recording (TELEMETRY_RECORD_MODE=change) the stored
+        rows are expanded back into a step-hold series (`step_hold`).
         
         Args:
             db: Database session
@@ -173,22 +232,21 @@ class DryerCRUD:
             limit: Maximum number of logs to return (most recent first)
         """
         query = select(models.DryerLogs)
+        start = _parse_time(start_time) if start_time else None
+        end = _parse_time(end_time) if end_time else None
         
         if dryer_id is not None:
             query = query.where(models.DryerLogs.dryer_id == dryer_id)
             
-        if start_time:
-            from datetime import datetime
-            start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-            query = query.where(models.DryerLogs.timestamp >= start_dt)
+        if start:
+            query = query.where(models.DryerLogs.timestamp >= start)
             
-        if end_time:
-            from datetime import datetime
-            end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-            query = query.where(models.DryerLogs.timestamp <= end_dt)
+        if end:
+            query = query.where(models.DryerLogs.timestamp <= end)
         
-        # Order by timestamp descending (most recent first)
-        query = query.order_by(models.DryerLogs.timestamp.desc())
+        # Most recent first; id (the rowid stored in every index entry) keeps
+        # ties deterministic without forcing a temp B-tree sort
+        query = query.order_by(models.DryerLogs.timestamp.desc(), models.DryerLogs.id.desc())
         
         if limit:
             query = query.limit(limit)
@@ -198,6 +256,12 @@ class DryerCRUD:
         
         # Return in chronological order (oldest first) for historical data
         logs_list = [schema.DryerLog.from_orm(log) for log in reversed(db_logs)] if db_logs else []
+
+        if TELEMETRY_RECORD_MODE == "change":
+            anchor = None
+            if dryer_id is not None and start and not limit:
+                anchor = await self._get_log_before(db, dryer_id, start)
+            logs_list = step_hold(logs_list, anchor=anchor, start=start, end=end)
         
         if dryer_id:
             logger.debug("get_logs dryer_id=%s start=%s end=%s limit=%s returned=%d", 
@@ -205,5 +269,152 @@ class DryerCRUD:
         
         return logs_list
 
+    def _log_rows_query(self, columns: Sequence[str], dryer_id: Optional[int],
+                        start: Optional[datetime], end: Optional[datetime]):
+        table = models.DryerLogs.__table__
+        query = select(*(table.c[name] for name in columns))
+        if dryer_id is not None:
+            query = query.where(table.c.dryer_id == dryer_id)
+        if start:
+            query = query.where(table.c.timestamp >= start)
+        if end:
+            query = query.where(table.c.timestamp <= end)
+        return query
+
+    async def get_log_rows(self, db: AsyncSession, dryer_id: Optional[int] = None,
+                           start_time: Optional[str] = None, end_time: Optional[str] = None,
+                           limit: Optional[int] = None, columns: Optional[Sequence[str]] = None) -> Log_rows:
+        """Core SQL fast path of `get_logs`: plain tuples of `columns`, oldest first.
+
+        Only the requested columns (default: all of LOG_COLUMNS, validated by
+        the caller) are selected through the same index-shaped statement; rows
+        skip the ORM identity map and per-row pydantic models. Change-only
+        recording needs the step-hold expansion and goes through `get_logs`.
+        """
+        columns = tuple(columns or LOG_COLUMNS)
+        if TELEMETRY_RECORD_MODE == "change":
+            logs = await self.get_logs(db, dryer_id, start_time, end_time, limit)
+            return Log_rows(columns, [tuple(getattr(log, name) for name in columns) for log in logs])
+        start = _parse_time(start_time) if start_time else None
+        end = _parse_time(end_time) if end_time else None
+        table = models.DryerLogs.__table__
+        query = self._log_rows_query(columns, dryer_id, start, end)
+        query = query.order_by(table.c.timestamp.desc(), table.c.id.desc())
+        if limit:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        rows = result.tuples().all()
+        rows.reverse()
+        logger.debug("get_log_rows dryer_id=%s start=%s end=%s limit=%s columns=%d returned=%d",
+                     dryer_id, start_time, end_time, limit, len(columns), len(rows))
+        return Log_rows(columns, rows)
+
+    async def stream_log_rows(self, chunk_size: int, dryer_id: Optional[int] = None,
+                              start_time: Optional[str] = None, end_time: Optional[str] = None,
+                              limit: Optional[int] = None, columns: Optional[Sequence[str]] = None) -> AsyncIterator[Log_rows]:
+        """Yield the rows `get_log_rows` would return in chunks of `chunk_size`.
+
+        Chunks are keyset pages (`get_log_page`), each read in its own short
+        session: no cursor or read transaction stays open while a (possibly
+        slow) consumer handles a chunk, so the SQLite WAL snapshot is never
+        pinned across the stream and only one chunk is held in memory. With
+        `limit` or change-only recording (step-hold needs the whole series)
+        the result of `get_log_rows` is chunked instead.
+        """
+        if limit or TELEMETRY_RECORD_MODE == "change":
+            async for session in get_db():
+                rows = await self.get_log_rows(session, dryer_id, start_time, end_time, limit, columns)
+            async for chunk in chunked(rows, chunk_size):
+                yield chunk
+            return
+        after = None
+        total = 0
+        while True:
+            async for session in get_db():
+                rows, after = await self.get_log_page(
+                    session, dryer_id, chunk_size, after=after, start_time=start_time,
+                    end_time=end_time, columns=columns
+                )
+            total += len(rows)
+            yield rows
+            if after is None:
+                break
+        logger.debug("stream_log_rows dryer_id=%s start=%s end=%s chunk_size=%s streamed=%d",
+                     dryer_id, start_time, end_time, chunk_size, total)
+
+    async def get_log_page(self, db: AsyncSession, dryer_id: Optional[int], page_size: int,
+                           after: Optional[Tuple[datetime, int]] = None,
+                           start_time: Optional[str] = None, end_time: Optional[str] = None,
+                           columns: Optional[Sequence[str]] = None,
+                           descending: bool = False) -> Tuple[Log_rows, Optional[Tuple[datetime, int]]]:
+        """One keyset page of stored logs ordered by (timestamp, id).
+
+        `after` is the (timestamp, id) key of the last row of the previous page;
+        the page continues strictly past it, so every page is an index seek
+        on ix_dryer_logs_dryer_id_timestamp however deep the client pages, and
+        rows inserted meanwhile never shift or repeat rows. `descending` walks
+        newest first. Returns the rows (in page order, projected to `columns`)
+        and the key to pass as `after` for the next page, or None on the last
+        page. Rows are returned as stored (no change-only step-hold expansion).
+        """
+        columns = tuple(columns or LOG_COLUMNS)
+        selected = columns + tuple(name for name in LOG_KEY if name not in columns)
+        start = _parse_time(start_time) if start_time else None
+        end = _parse_time(end_time) if end_time else None
+        table = models.DryerLogs.__table__
+        key = tuple_(table.c.timestamp, table.c.id)
+        query = self._log_rows_query(selected, dryer_id, start, end)
+        if after is not None:
+            query = query.where(key < tuple_(*after) if descending else key > tuple_(*after))
+        if descending:
+            query = query.order_by(table.c.timestamp.desc(), table.c.id.desc())
+        else:
+            query = query.order_by(table.c.timestamp, table.c.id)
+        # One extra row tells whether another page follows
+        result = await db.execute(query.limit(page_size + 1))
+        rows = result.tuples().all()
+        next_key = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last = rows[-1]
+            next_key = tuple(last[selected.index(name)] for name in LOG_KEY)
+        if len(selected) > len(columns):
+            rows = [row[:len(columns)] for row in rows]
+        logger.debug("get_log_page dryer_id=%s after=%s page_size=%s descending=%s returned=%d",
+                     dryer_id, after, page_size, descending, len(rows))
+        return Log_rows(columns, rows), next_key
+
+    async def _get_log_before(self, db: AsyncSession, dryer_id: int, before: datetime) -> Optional[schema.DryerLog]:
+        """Latest log of a dryer strictly before `before` (index seek)."""
+        result = await db.execute(
+            select(models.DryerLogs)
+            .where(models.DryerLogs.dryer_id == dryer_id, models.DryerLogs.timestamp < before)
+            .order_by(models.DryerLogs.timestamp.desc(), models.DryerLogs.id.desc())
+            .limit(1)
+        )
+        db_log = result.scalar_one_or_none()
+        return schema.DryerLog.from_orm(db_log) if db_log else None
+
+    async def get_history(self, db: AsyncSession, dryer_id: Optional[int] = None,
+                          start_time: Optional[str] = None, end_time: Optional[str] = None,
+                          limit: Optional[int] = None, max_points: Optional[int] = None) -> list[schema.DryerLog]:
+        """Return chart history: raw logs, or rollup buckets for long ranges.
+
+        With `max_points` the resolution is picked from the requested range
+        (`start_time` defaults to the oldest recorded bucket): raw rows while
+        they fit the budget, else the finest rollup that does. `max_points` is
+        per dryer. Without it this is `get_logs`.
+        """
+        if max_points:
+            start = _parse_time(start_time) if start_time else await rollup_crud.get_earliest(db, dryer_id)
+            end = _parse_time(end_time) if end_time else datetime.utcnow()
+            if start is not None:
+                resolution = pick_resolution((end - start).total_seconds(), max_points)
+                if resolution:
+                    return await rollup_crud.get_rollups(
+                        db, resolution, dryer_id=dryer_id, start=start,
+                        end=end if end_time else None, limit=limit
+                    )
+        return await self.get_logs(db, dryer_id=dryer_id, start_time=start_time, end_time=end_time, limit=limit)
 
 dryer_crud = DryerCRUD()
\ No newline at end of file
@@ -6,6 +6,7 @@ from typing import Optional
 from sqlalchemy.orm import selectinload
 from sqlalchemy import and_
 from api.logger import get_logger
+from api.cruds.config_cache import config_cache, MISSING
 
 logger = get_logger("preset_crud")
 
@@ -33,6 +34,7 @@ class PresetCRUD:
         db_preset = models.Preset(**preset_data.dict())
         db.add(db_preset)
         await db.commit()
+        config_cache.invalidate("create_preset")
         await db.refresh(db_preset)
         preset = await self.get_preset(db ,db_preset.id)
         logger.info("create_preset success id=%s name=%s", db_preset.id, preset_data.name)
@@ -57,6 +59,7 @@ class PresetCRUD:
             for key, value in preset_data.dict(exclude_unset=True).items():
                 setattr(db_preset, key, value)
             await db.commit()
+            config_cache.invalidate("update_preset")
             await db.refresh(db_preset)
             logger.info("update_preset success id=%s", preset_id)
             return await self.get_preset(db ,db_preset.id)
@@ -83,6 +86,20 @@ class PresetCRUD:
         db_preset = result.scalar_one_or_none()
         return schema.Preset.from_orm(db_preset) if db_preset else None
 
+    async def get_preset_cached(
+        self,
+        session: AsyncSession,
+        preset_id: int
+    ) -> Optional[models.Preset]:
+        """`get_preset` served from the config cache (reloaded after preset / dryer writes)."""
+        key = ("preset", preset_id)
+        preset = config_cache.get(key)
+        if preset is MISSING:
+            version = config_cache.version
+            preset = await self.get_preset(session, preset_id)
+            config_cache.set(key, preset, version)
+        return preset
+
     async def delete_preset(
         self, 
         db: AsyncSession, 
@@ -100,6 +117,7 @@ class PresetCRUD:
         if db_preset:
             await db.delete(db_preset)
             await db.commit()
+            config_cache.invalidate("delete_preset")
             logger.info("delete_preset success id=%s", preset_id)
             return True
         logger.warning("delete_preset not_found id=%s", preset_id)
@@ -118,6 +136,7 @@ class PresetCRUD:
         db_link = models.DryerPresetAssociation(**link_data.dict())
         db.add(db_link)
         await db.commit()
+        config_cache.invalidate("create_preset_link")
         await db.refresh(db_link)
         logger.info("create_preset_link success preset_id=%s dryer_id=%s", link_data.preset_id, link_data.dryer_id)
         return schema.DryerPresetAssociation.from_orm(db_link) if db_link else None
@@ -138,6 +157,21 @@ class PresetCRUD:
         db_link = result.scalar_one_or_none()
         return schema.DryerPresetAssociation.from_orm(db_link) if db_link else None
 
+    async def get_preset_link_cached(
+        self,
+        session: AsyncSession,
+        preset_id: int,
+        dryer_id: int
+    ) -> Optional[models.DryerPresetAssociation]:
+        """`get_preset_link` served from the config cache (reloaded after link writes)."""
+        key = ("preset_link", preset_id, dryer_id)
+        link = config_cache.get(key)
+        if link is MISSING:
+            version = config_cache.version
+            link = await self.get_preset_link(session, preset_id, dryer_id)
+            config_cache.set(key, link, version)
+        return link
+
     async def delete_preset_link(
         self, 
         db: AsyncSession, 
@@ -156,6 +190,7 @@ class PresetCRUD:
         if db_link:
             await db.delete(db_link)
             await db.commit()
+            config_cache.invalidate("delete_preset_link")
             logger.info("delete_preset_link success preset_id=%s dryer_id=%s", preset_id, dryer_id)
             return True
         logger.warning("delete_preset_link not_found preset_id=%s dryer_id=%s", preset_id, dryer_id)
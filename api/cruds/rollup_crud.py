@@ -0,0 +1,231 @@
+"""Telemetry rollups: per-dryer aggregates at 1-minute / 15-minute / hourly buckets.
+
+Rollups are folded in from every batch of raw logs inside the same
+transaction (`add_logs`): the batch is aggregated in memory, then each
+touched bucket is upserted with INSERT .. ON CONFLICT, merging min/max,
+sample-weighted means and duty fractions with the stored row. Long-range
+history reads use `pick_resolution` to serve a few thousand buckets instead
+of millions of raw rows.
+"""
+
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select, delete, func, case, literal_column
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from api import models
+from api.schemas import dryer_schema as schema
+from api.logger import get_logger
+from api.config import RAW_SAMPLE_PERIOD
+
+logger = get_logger("rollup_crud")
+
+# Bucket widths in seconds, finest first
+ROLLUP_RESOLUTIONS = (60, 900, 3600)
+# Raw rows are still served up to this multiple of max_points (LTTB trims them to the budget)
+HISTORY_RAW_OVERSAMPLE = float(os.getenv("HISTORY_RAW_OVERSAMPLE", "4"))
+
+_EPOCH = datetime(1970, 1, 1)
+_MEAN_FIELDS = {
+    "temperature_mean": "temperature",
+    "relative_humidity_mean": "relative_humidity",
+    "absolute_humidity_mean": "absolute_humidity",
+    "heater_temperature_mean": "heater_temperature",
+    "heater_duty": "heater_is_on",
+    "heater_fan_duty": "heater_fan_is_run",
+    "servo_open_fraction": "servo_is_open",
+}
+_LAST_FIELDS = ("status", "current_preset_id", "time_left_drying")
+
+
+def bucket_start(timestamp: datetime, resolution: int) -> datetime:
+    """Floor a naive UTC timestamp to the start of its `resolution`-second bucket."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    seconds = int((timestamp - _EPOCH).total_seconds())
+    return _EPOCH + timedelta(seconds=seconds - seconds % resolution)
+
+
+def pick_resolution(span_seconds: float, max_points: Optional[int]) -> int:
+    """Choose the data resolution for a history range under a point budget.
+
+    Returns 0 (raw rows) when raw sampling fits HISTORY_RAW_OVERSAMPLE times
+    the budget (the caller downsamples them), otherwise the finest rollup
+    resolution whose bucket count fits `max_points`, falling back to the
+    coarsest one.
+    """
+    if not max_points or span_seconds / RAW_SAMPLE_PERIOD <= max_points * HISTORY_RAW_OVERSAMPLE:
+        return 0
+    for resolution in ROLLUP_RESOLUTIONS:
+        if span_seconds / resolution <= max_points:
+            return resolution
+    return ROLLUP_RESOLUTIONS[-1]
+
+
+def _reading(log: schema.DryerLogBase, field: str, stat: str) -> float:
+    # Interval-summary rows carry min/max/mean; plain rows only the sample itself
+    value = getattr(log, f"{field}_{stat}", None)
+    return getattr(log, field) if value is None else value
+
+
+def _aggregate(logs: Iterable[schema.DryerLogBase]) -> List[dict]:
+    """Fold a batch of logs into one row per (dryer_id, resolution, bucket).
+
+    Rows summarising several control-loop samples (`samples`) are weighted
+    accordingly and contribute their interval min/max/mean.
+    """
+    buckets: Dict[Tuple[int, int, datetime], dict] = {}
+    for log in logs:
+        weight = log.samples or 1
+        temperature_min, temperature_max = _reading(log, "temperature", "min"), _reading(log, "temperature", "max")
+        humidity_min, humidity_max = _reading(log, "relative_humidity", "min"), _reading(log, "relative_humidity", "max")
+        for resolution in ROLLUP_RESOLUTIONS:
+            key = (log.dryer_id, resolution, bucket_start(log.timestamp, resolution))
+            row = buckets.get(key)
+            if row is None:
+                row = {
+                    "dryer_id": log.dryer_id, "resolution": resolution, "bucket": key[2], "samples": 0,
+                    "last_timestamp": log.timestamp,
+                    "temperature_min": temperature_min, "temperature_max": temperature_max,
+                    "relative_humidity_min": humidity_min, "relative_humidity_max": humidity_max,
+                }
+                row.update({field: 0.0 for field in _MEAN_FIELDS})
+                buckets[key] = row
+            row["samples"] += weight
+            row["temperature_min"] = min(row["temperature_min"], temperature_min)
+            row["temperature_max"] = max(row["temperature_max"], temperature_max)
+            row["relative_humidity_min"] = min(row["relative_humidity_min"], humidity_min)
+            row["relative_humidity_max"] = max(row["relative_humidity_max"], humidity_max)
+            for field, source in _MEAN_FIELDS.items():
+                row[field] += float(_reading(log, source, "mean")) * weight  # running sum, divided below
+            if log.timestamp >= row["last_timestamp"]:
+                row["last_timestamp"] = log.timestamp
+                row["status"] = str(log.status)
+                row["current_preset_id"] = log.current_preset_id
+                row["time_left_drying"] = log.time_left_drying
+    rows = list(buckets.values())
+    for row in rows:
+        for field in _MEAN_FIELDS:
+            row[field] /= row["samples"]
+    return rows
+
+
+class RollupCRUD:
+    """Maintenance and reads of `DryerLogRollup` buckets."""
+
+    async def add_logs(self, db: AsyncSession, logs: List[schema.DryerLogBase]) -> int:
+        """Merge a batch of raw logs into the rollup buckets (caller commits).
+
+        Returns the number of bucket rows upserted.
+        """
+        rows = _aggregate(logs)
+        if not rows:
+            return 0
+        table = models.DryerLogRollup.__table__
+        stmt = insert(table)
+        new = stmt.excluded
+        total = table.c.samples + new.samples
+        newer = new.last_timestamp >= table.c.last_timestamp
+        updates = {
+            "samples": total,
+            "temperature_min": func.min(table.c.temperature_min, new.temperature_min),
+            "temperature_max": func.max(table.c.temperature_max, new.temperature_max),
+            "relative_humidity_min": func.min(table.c.relative_humidity_min, new.relative_humidity_min),
+            "relative_humidity_max": func.max(table.c.relative_humidity_max, new.relative_humidity_max),
+            "last_timestamp": func.max(table.c.last_timestamp, new.last_timestamp),
+        }
+        for field in _MEAN_FIELDS:
+            updates[field] = (table.c[field] * table.c.samples + new[field] * new.samples) / total
+        for field in _LAST_FIELDS:
+            updates[field] = case((newer, new[field]), else_=table.c[field])
+        stmt = stmt.on_conflict_do_update(index_elements=["dryer_id", "resolution", "bucket"], set_=updates)
+        await db.execute(stmt, rows)
+        return len(rows)
+
+    async def get_earliest(self, db: AsyncSession, dryer_id: Optional[int] = None) -> Optional[datetime]:
+        """Start of the oldest hourly bucket (None when nothing was recorded)."""
+        query = select(func.min(models.DryerLogRollup.bucket)).where(
+            models.DryerLogRollup.resolution == ROLLUP_RESOLUTIONS[-1])
+        if dryer_id is not None:
+            query = query.where(models.DryerLogRollup.dryer_id == dryer_id)
+        result = await db.execute(query)
+        return result.scalar()
+
+    async def get_rollups(self, db: AsyncSession, resolution: int, dryer_id: Optional[int] = None,
+                          start: Optional[datetime] = None, end: Optional[datetime] = None,
+                          limit: Optional[int] = None) -> List[schema.DryerLogRollup]:
+        """Return buckets of one resolution in chronological order.
+
+        The bucket containing `start` is included; `limit` keeps the most recent
+        buckets.
+        """
+        rollup = models.DryerLogRollup
+        query = select(rollup).where(rollup.resolution == resolution)
+        if dryer_id is not None:
+            query = query.where(rollup.dryer_id == dryer_id)
+        if start:
+            query = query.where(rollup.bucket >= bucket_start(start, resolution))
+        if end:
+            query = query.where(rollup.bucket <= end)
+        query = query.order_by(rollup.bucket.desc(), rollup.dryer_id.desc())
+        if limit:
+            query = query.limit(limit)
+        result = await db.execute(query)
+        rows = result.scalars().all()
+        rollups = [_to_schema(row) for row in reversed(rows)]
+        logger.debug("get_rollups dryer_id=%s resolution=%s start=%s end=%s returned=%d",
+                     dryer_id, resolution, start, end, len(rollups))
+        return rollups
+
+    async def delete_before(self, db: AsyncSession, resolution: int, cutoff: datetime, limit: int) -> int:
+        """Delete up to `limit` buckets of `resolution` that start before `cutoff`.
+
+        Chunks are picked through ix_dryer_log_rollups_resolution_bucket and
+        committed on their own. Returns rows deleted.
+        """
+        rollup = models.DryerLogRollup
+        rowid = literal_column("rowid")
+        chunk = (
+            select(rowid).select_from(rollup)
+            .where(rollup.resolution == resolution, rollup.bucket < cutoff)
+            .order_by(rollup.bucket)
+            .limit(limit)
+        )
+        result = await db.execute(delete(rollup).where(rowid.in_(chunk)))
+        await db.commit()
+        return result.rowcount or 0
+
+
+def _to_schema(row: models.DryerLogRollup) -> schema.DryerLogRollup:
+    # Negative ids keep buckets distinct from raw log ids on the client
+    bucket_epoch = int((row.bucket - _EPOCH).total_seconds())
+    return schema.DryerLogRollup(
+        id=-bucket_epoch,
+        dryer_id=row.dryer_id,
+        current_preset_id=row.current_preset_id,
+        timestamp=row.bucket,
+        status=row.status,
+        heater_temperature=row.heater_temperature_mean,
+        heater_is_on=row.heater_duty >= 0.5,
+        heater_fan_is_run=row.heater_fan_duty >= 0.5,
+        temperature=row.temperature_mean,
+        servo_is_open=row.servo_open_fraction >= 0.5,
+        absolute_humidity=row.absolute_humidity_mean,
+        relative_humidity=row.relative_humidity_mean,
+        time_left_drying=row.time_left_drying,
+        resolution=row.resolution,
+        samples=row.samples,
+        temperature_min=row.temperature_min,
+        temperature_max=row.temperature_max,
+        relative_humidity_min=row.relative_humidity_min,
+        relative_humidity_max=row.relative_humidity_max,
+        heater_duty=row.heater_duty,
+        servo_open_fraction=row.servo_open_fraction,
+        temperature_mean=row.temperature_mean,
+        relative_humidity_mean=row.relative_humidity_mean,
+        heater_temperature_mean=row.heater_temperature_mean,
+    )
+
+
+rollup_crud = RollupCRUD()
@@ -2,7 +2,11 @@
 
 Provides:
 * WebSocket streaming of dryer log history and live updates
+* Keyset-paginated REST access to stored dryer logs
+* Streaming CSV / NDJSON export of stored dryer logs
 * Control endpoint to set a preset (or reset to pending) for a running dryer
+* Runtime stats endpoints (actuator write suppression, G-code batching
+  counters, control loop tick timing)
 
 WebSocket Endpoints:
 -------------------
@@ -15,6 +19,13 @@ WebSocket Endpoints:
      * start_time: ISO datetime (e.g., "2025-12-18T10:00:00Z") - filter logs after this time
      * end_time: ISO datetime - filter logs before this time
      * limit: max number of historical logs (optional) - limits result set if needed
+     * max_points: point budget (optional) - long ranges come from rollups and the
+       history is LTTB-downsampled to at most this many points
+     * chunk_size: logs per history frame (optional) - history is streamed as
+       {"history_chunk": [...], "seq": n, "done": bool} frames instead of one
+       {"history": [...]} frame; live updates interleave with the chunks
+     * format: "json" (default) or "columnar" - struct-of-arrays frames with
+       delta-encoded timestamps and fixed-point readings (api.tools.columnar)
    
    Frontend Usage Example (TypeScript):
    -----------------------------------
@@ -33,20 +44,32 @@ WebSocket Endpoints:
    );
 """
 
-from fastapi import APIRouter, HTTPException, Request, WebSocket, status, WebSocketDisconnect, Depends
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, status, WebSocketDisconnect, Depends
 from api.logger import get_logger
 from api.schemas import dryer_schema
 from api.websocket_manager import webSocketManager
-from api.cruds.dryer_crud import dryer_crud
+from api.cruds.dryer_crud import dryer_crud, chunked, _parse_time
 from api.cruds.preset_crud import preset_crud
 from api.database import get_db
+from api.workers.status_worker import statusWorker
+from api.workers.telemetry_writer import telemetryWriter
+from api.tools.downsample import downsample_logs
+from api.tools.columnar import MESSAGE_FORMATS, encode_columns, encode_rows, dumps_compact
+from api.tools.log_rows import Log_rows, LOG_COLUMNS, encode_cursor, decode_cursor
+from api.tools.log_export import EXPORT_FORMATS, export_chunks
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 import json
-from typing import Optional, Any
+import os
+from typing import AsyncIterator, Optional, Any
 
 router = APIRouter()
 logger = get_logger("dashboard_page_endpoint")
 
+LOGS_PAGE_SIZE = int(os.getenv("LOGS_PAGE_SIZE", "500"))
+# Larger page_size requests are capped to this
+LOGS_PAGE_MAX = int(os.getenv("LOGS_PAGE_MAX", "5000"))
+
 
 def get_app(request: Request):
     """Dependency returning current FastAPI app (for runtime dryer instances)."""
@@ -59,6 +82,9 @@ async def dryers_stats_websocket(
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
     limit: Optional[int] = None,
+    max_points: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    message_format: str = Query("json", alias="format"),
     db: AsyncSession = Depends(get_db)
 ):
     """WebSocket endpoint streaming historical and live logs for ALL dryers.
@@ -69,24 +95,42 @@ async def dryers_stats_websocket(
     - start_time: ISO datetime string (e.g., 2025-12-18T10:00:00Z) - logs after this time
     - end_time: ISO datetime string - logs before this time  
     - limit: Maximum number of historical logs to load per dryer (optional)
+    - max_points: Point budget per dryer; long ranges are served from rollups and
+      the result is LTTB-downsampled to the budget (optional)
+    - chunk_size: Stream history in frames of this many logs (optional, see
+      `send_history_chunks`)
+    - format: "json" (row objects, default) or "columnar" (see api.tools.columnar)
+      for history and live frames
 
     Sends filtered history then streams live updates for all dryers.
     """
-    logger.debug("WS /dashboard/dryers connect start=%s end=%s limit=%s (deprecated - consider /dryer/{id})", 
-                 start_time, end_time, limit)
-    await webSocketManager.connect(websocket, 'dryers_stats')
+    logger.debug("WS /dashboard/dryers connect start=%s end=%s limit=%s max_points=%s (deprecated - consider /dryer/{id})", 
+                 start_time, end_time, limit, max_points)
+    message_format = _message_format(message_format)
+    await webSocketManager.connect(websocket, 'dryers_stats', message_format)
     
     # Fetch filtered historical logs (all dryers)
     try:
-        old_logs = await dryer_crud.get_logs(
-            db,
-            start_time=start_time,
-            end_time=end_time,
-            limit=limit
-        )
-        history = {'history': [json.loads(log.json()) for log in old_logs]}
-        await websocket.send_text(json.dumps(history))
-        logger.debug("WS /dashboard/dryers sent %d historical logs", len(old_logs))
+        # Rows still queued in the telemetry writer would be missing from history
+        await telemetryWriter.flush()
+        if max_points:
+            old_logs = await dryer_crud.get_history(
+                db,
+                start_time=start_time,
+                end_time=end_time,
+                limit=limit,
+                max_points=max_points
+            )
+            sent = await send_history(websocket, downsample_logs(old_logs, max_points), chunk_size, message_format)
+        elif chunk_size:
+            sent = await send_history_chunks(websocket, message_format, dryer_crud.stream_log_rows(
+                chunk_size, start_time=start_time, end_time=end_time, limit=limit
+            ))
+        else:
+            sent = await send_history(websocket, await dryer_crud.get_log_rows(
+                db, start_time=start_time, end_time=end_time, limit=limit
+            ), message_format=message_format)
+        logger.debug("WS /dashboard/dryers sent %d historical logs", sent)
     except Exception as e:  # non-fatal, continue with live stream
         logger.warning("Failed to send history over WS error=%s", e)
     
@@ -114,6 +158,9 @@ async def dryer_stats_websocket(
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
     limit: Optional[int] = None,
+    max_points: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    message_format: str = Query("json", alias="format"),
     db: AsyncSession = Depends(get_db)
 ):
     """WebSocket endpoint for a SINGLE dryer with optimized log filtering.
@@ -122,27 +169,58 @@ async def dryer_stats_websocket(
     - start_time: ISO datetime string (e.g., 2025-12-18T10:00:00Z) - logs after this time
     - end_time: ISO datetime string - logs before this time  
     - limit: Maximum number of historical logs to load (optional)
+    - max_points: Point budget; long ranges are served from 1 min / 15 min / 1 h rollups and
+      the result is LTTB-downsampled to the budget (optional)
+    - chunk_size: Stream history in frames of this many logs (optional, see
+      `send_history_chunks`)
+    - format: "json" (row objects, default) or "columnar" (see api.tools.columnar)
+      for history and live frames
 
+    Ranges within the last TELEMETRY_BUFFER_HOURS are answered from the running
+    dryer's in-memory buffer without touching the database.
     Sends filtered history then streams live updates for this dryer only.
     """
-    logger.debug("WS /dashboard/dryer/%s connect start=%s end=%s limit=%s", 
-                 dryer_id, start_time, end_time, limit)
+    logger.debug("WS /dashboard/dryer/%s connect start=%s end=%s limit=%s max_points=%s", 
+                 dryer_id, start_time, end_time, limit, max_points)
     
     # Register for live updates specific to this dryer
-    await webSocketManager.connect(websocket, f'dryer_{dryer_id}_stats')
+    message_format = _message_format(message_format)
+    await webSocketManager.connect(websocket, f'dryer_{dryer_id}_stats', message_format)
     
     # Fetch filtered historical logs
     try:
-        old_logs = await dryer_crud.get_logs(
-            db, 
-            dryer_id=dryer_id,
-            start_time=start_time,
-            end_time=end_time,
-            limit=limit
-        )
-        history = {'history': [json.loads(log.json()) for log in old_logs]}
-        await websocket.send_text(json.dumps(history))
-        logger.debug("WS /dashboard/dryer/%s sent %d historical logs", dryer_id, len(old_logs))
+        # Recent ranges come from the running dryer's in-memory telemetry buffer
+        runtime_dryer = await get_dryer(websocket.app, dryer_id)
+        old_logs = runtime_dryer.get_recent_logs(start_time, end_time, limit, max_points) if runtime_dryer else None
+        source = "buffer"
+        if old_logs is None:
+            # Rows still queued in the telemetry writer would be missing from history
+            await telemetryWriter.flush()
+            if max_points:
+                source = "db"
+                old_logs = await dryer_crud.get_history(
+                    db, 
+                    dryer_id=dryer_id,
+                    start_time=start_time,
+                    end_time=end_time,
+                    limit=limit,
+                    max_points=max_points
+                )
+            elif chunk_size:
+                source = "cursor"
+                sent = await send_history_chunks(websocket, message_format, dryer_crud.stream_log_rows(
+                    chunk_size, dryer_id=dryer_id, start_time=start_time, end_time=end_time, limit=limit
+                ))
+            else:
+                source = "db"
+                old_logs = await dryer_crud.get_log_rows(
+                    db, dryer_id=dryer_id, start_time=start_time, end_time=end_time, limit=limit
+                )
+        if old_logs is not None:
+            if max_points:
+                old_logs = downsample_logs(old_logs, max_points)
+            sent = await send_history(websocket, old_logs, chunk_size, message_format)
+        logger.debug("WS /dashboard/dryer/%s sent %d historical logs source=%s", dryer_id, sent, source)
     except Exception as e:
         logger.warning("Failed to send history for dryer %s: %s", dryer_id, e)
     
@@ -204,6 +282,210 @@ async def dryer_control_set_preset(dryer_id: int, preset_id: Optional[int] = Non
     return {"success": True, "message": f"Dryer with id {dryer_id} set to status {dryer_status} with preset {existing_preset.name}"}
 
 
+@router.get("/dryer/{dryer_id}/stats")
+async def dryer_runtime_stats(dryer_id: int, app = Depends(get_app)):
+    """Return runtime counters of a running dryer instance (404 if not running)."""
+    logger.debug("GET /dashboard/dryer/%s/stats", dryer_id)
+    runtime_dryer = await get_dryer(app, dryer_id)
+    if not runtime_dryer:
+        logger.warning("Dryer not found dryer_id=%s (runtime instances)", dryer_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Dryer with id {dryer_id} not found"
+        )
+    return runtime_dryer.runtime_stats()
+
+
+@router.get("/dryer/{dryer_id}/logs")
+async def dryer_logs_page(
+    dryer_id: int,
+    cursor: Optional[str] = None,
+    page_size: int = Query(LOGS_PAGE_SIZE, ge=1),
+    columns: Optional[str] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    order: str = "asc",
+    db: AsyncSession = Depends(get_db)
+):
+    """Page through stored logs of a dryer (keyset pagination on (timestamp, id)).
+
+    Query parameters:
+    - cursor: `next_cursor` of the previous page (omit for the first page)
+    - page_size: rows per page (default LOGS_PAGE_SIZE, capped at LOGS_PAGE_MAX)
+    - columns: comma separated log fields to return (default: all)
+    - start_time / end_time: ISO datetime bounds (inclusive)
+    - order: "asc" (oldest first, default) or "desc" (newest first)
+
+    Each page is an index seek past the cursor, so deep pages cost the same
+    as the first and rows written meanwhile never shift the pages. Repeat
+    the same filters with each cursor; `next_cursor` is null on the last page.
+    Raises 400 on an invalid cursor, column, time or order and 404 if the
+    dryer does not exist.
+    """
+    logger.debug("GET /dashboard/dryer/%s/logs cursor=%s page_size=%s columns=%s order=%s",
+                 dryer_id, cursor, page_size, columns, order)
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid order {order!r}, use 'asc' or 'desc'")
+    selected = _log_columns(columns)
+    _check_time_range(start_time, end_time)
+    after = None
+    if cursor:
+        after = decode_cursor(cursor)
+        if after is None:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    if not await dryer_crud.get_dryer_config(db, dryer_id):
+        logger.warning("Dryer not found dryer_id=%s (db lookup)", dryer_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Dryer with id {dryer_id} not found"
+        )
+    page_size = min(page_size, LOGS_PAGE_MAX)
+    await telemetryWriter.flush()
+    rows, next_key = await dryer_crud.get_log_page(
+        db, dryer_id, page_size, after=after, start_time=start_time, end_time=end_time,
+        columns=selected, descending=order == "desc"
+    )
+    # Rows are plain JSON types already; skip the generic response encoder
+    return JSONResponse({
+        "dryer_id": dryer_id,
+        "columns": list(rows.columns),
+        "page_size": page_size,
+        "items": rows.dicts(),
+        "next_cursor": encode_cursor(next_key) if next_key else None,
+    })
+
+
+@router.get("/dryer/{dryer_id}/export")
+async def dryer_logs_export(
+    dryer_id: int,
+    export_format: str = Query("csv", alias="format"),
+    columns: Optional[str] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    gzip: bool = False,
+    db: AsyncSession = Depends(get_db)
+):
+    """Download stored logs of a dryer as CSV or NDJSON (streamed).
+
+    Query parameters:
+    - format: "csv" (default, header row first) or "ndjson" (one JSON object per line)
+    - columns: comma separated log fields to export (default: all)
+    - start_time / end_time: ISO datetime bounds (inclusive)
+    - gzip: compress the download (file name gets .gz)
+
+    The body is produced page by page (see api.tools.log_export), so memory
+    stays flat and the database is only read in short transactions however
+    many rows are exported. Raises 400 on an invalid format, column or time
+    and 404 if the dryer does not exist.
+    """
+    logger.debug("GET /dashboard/dryer/%s/export format=%s columns=%s start=%s end=%s gzip=%s",
+                 dryer_id, export_format, columns, start_time, end_time, gzip)
+    if export_format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid format {export_format!r}, use one of {list(EXPORT_FORMATS)}"
+        )
+    selected = _log_columns(columns)
+    _check_time_range(start_time, end_time)
+    if not await dryer_crud.get_dryer_config(db, dryer_id):
+        logger.warning("Dryer not found dryer_id=%s (db lookup)", dryer_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Dryer with id {dryer_id} not found"
+        )
+    await telemetryWriter.flush()
+    filename = f"dryer_{dryer_id}_logs.{export_format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        export_chunks(dryer_id, export_format, selected, start_time, end_time, compress=gzip),
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/worker/stats")
+async def status_worker_stats():
+    """Return control loop tick timing (jitter, overruns) of the status worker."""
+    logger.debug("GET /dashboard/worker/stats")
+    return statusWorker.stats()
+
+
+def _log_columns(columns: Optional[str]) -> Optional[tuple]:
+    """Validated column projection from a comma separated list (None = all columns)."""
+    if not columns:
+        return None
+    selected = tuple(dict.fromkeys(name.strip() for name in columns.split(",") if name.strip()))
+    unknown = [name for name in selected if name not in LOG_COLUMNS]
+    if unknown or not selected:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown columns {unknown}, available: {list(LOG_COLUMNS)}"
+        )
+    return selected
+
+
+def _check_time_range(start_time: Optional[str], end_time: Optional[str]):
+    for value in (start_time, end_time):
+        if value is None:
+            continue
+        try:
+            _parse_time(value)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid ISO datetime {value!r}")
+
+
+def _message_format(message_format: str) -> str:
+    if message_format not in MESSAGE_FORMATS:
+        logger.warning("Unknown message format=%s, using json", message_format)
+        return "json"
+    return message_format
+
+
+def _encode_frame(frame: dict, logs, key: str, message_format: str) -> str:
+    """Serialise a frame whose `key` holds `logs` as row objects or one columnar block.
+
+    `logs` is a list of `DryerLog` (buffer, rollups) or `Log_rows` from the
+    Core SQL path, which is encoded straight from its tuples.
+    """
+    rows = isinstance(logs, Log_rows)
+    if message_format == "columnar":
+        frame[key] = encode_rows(logs) if rows else encode_columns(logs)
+        return dumps_compact(frame)
+    frame[key] = logs.dicts() if rows else [json.loads(log.json()) for log in logs]
+    return json.dumps(frame)
+
+
+async def send_history(websocket: WebSocket, logs: list, chunk_size: Optional[int] = None,
+                       message_format: str = "json") -> int:
+    """Send loaded history as one {"history": ...} frame, or chunked with `chunk_size`."""
+    if chunk_size:
+        return await send_history_chunks(websocket, message_format, chunked(logs, chunk_size))
+    await websocket.send_text(_encode_frame({}, logs, 'history', message_format))
+    return len(logs)
+
+
+async def send_history_chunks(websocket: WebSocket, message_format: str, chunks: AsyncIterator[list]) -> int:
+    """Send history as {"history_chunk": [...], "seq": n, "done": bool} frames.
+
+    One chunk is read ahead so the last frame carries done=true (an empty
+    history still sends one). Only that chunk is held in memory, and live
+    updates broadcast meanwhile go out between frames. Returns logs sent.
+    """
+    seq = sent = 0
+    pending = None
+    async for chunk in chunks:
+        if pending is not None:
+            await _send_history_chunk(websocket, message_format, pending, seq, False)
+            seq += 1
+        pending = chunk
+        sent += len(chunk)
+    await _send_history_chunk(websocket, message_format, pending or [], seq, True)
+    return sent
+
+
+async def _send_history_chunk(websocket: WebSocket, message_format: str, logs: list, seq: int, done: bool):
+    await websocket.send_text(_encode_frame({'seq': seq, 'done': done}, logs, 'history_chunk', message_format))
+
+
 async def get_dryer(app, id: int):
     """Return runtime dryer instance by id (None if not found)."""
     for i in reversed(range(len(app.state.dryer_instances))):
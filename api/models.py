@@ -7,7 +7,7 @@ translated to English for consistency.
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -151,6 +151,10 @@ class Preset(Base):
 class DryerLogs(Base):
     """Per-interval telemetry snapshot for dryer operations."""
     __tablename__ = 'dryer_logs'
+    __table_args__ = (
+        Index('ix_dryer_logs_dryer_id_timestamp', 'dryer_id', 'timestamp'),
+        Index('ix_dryer_logs_timestamp', 'timestamp'),
+    )
 
     id = Column(Integer, primary_key=True)
     dryer_id = Column(Integer, ForeignKey('dryers.id'))
@@ -165,6 +169,17 @@ class DryerLogs(Base):
     relative_humidity = Column(Float)
     current_preset_id = Column(Integer, nullable=True)
     time_left_drying = Column(Integer, nullable=True)
+    # Sub-interval summary when samples are aggregated before persisting (NULL otherwise)
+    samples = Column(Integer, nullable=True)
+    temperature_min = Column(Float, nullable=True)
+    temperature_max = Column(Float, nullable=True)
+    temperature_mean = Column(Float, nullable=True)
+    relative_humidity_min = Column(Float, nullable=True)
+    relative_humidity_max = Column(Float, nullable=True)
+    relative_humidity_mean = Column(Float, nullable=True)
+    heater_temperature_min = Column(Float, nullable=True)
+    heater_temperature_max = Column(Float, nullable=True)
+    heater_temperature_mean = Column(Float, nullable=True)
 
     dryer = relationship("Dryer", back_populates="logs")
 
@@ -172,6 +187,43 @@ class DryerLogs(Base):
         return f"<DryerLogs(dryer_id={self.dryer_id}, time={self.timestamp}, temp={self.temperature}°C)>"
 
 
+class DryerLogRollup(Base):
+    """Per-dryer telemetry aggregate over a fixed time bucket (1 min / 15 min / 1 h).
+
+    Maintained incrementally from batches of `DryerLogs`; `resolution` is the
+    bucket width in seconds and `bucket` its UTC start.
+    """
+    __tablename__ = 'dryer_log_rollups'
+    __table_args__ = (
+        Index('ix_dryer_log_rollups_resolution_bucket', 'resolution', 'bucket'),
+    )
+
+    dryer_id = Column(Integer, ForeignKey('dryers.id'), primary_key=True)
+    resolution = Column(Integer, primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+    samples = Column(Integer, default=0)
+    last_timestamp = Column(DateTime)
+    status = Column(String(25))
+    current_preset_id = Column(Integer, nullable=True)
+    time_left_drying = Column(Integer, nullable=True)
+    temperature_min = Column(Float)
+    temperature_max = Column(Float)
+    temperature_mean = Column(Float)
+    relative_humidity_min = Column(Float)
+    relative_humidity_max = Column(Float)
+    relative_humidity_mean = Column(Float)
+    absolute_humidity_mean = Column(Float)
+    heater_temperature_mean = Column(Float)
+    heater_duty = Column(Float)
+    heater_fan_duty = Column(Float)
+    servo_open_fraction = Column(Float)
+
+    dryer = relationship("Dryer", back_populates="rollups")
+
+    def __repr__(self):
+        return f"<DryerLogRollup(dryer_id={self.dryer_id}, resolution={self.resolution}, bucket={self.bucket})>"
+
+
 class Dryer(Base):
     """Primary physical dryer unit entity linking all configuration components."""
     __tablename__ = 'dryers'
@@ -180,6 +232,7 @@ class Dryer(Base):
     name = Column(String(50))
 
     logs = relationship("DryerLogs", back_populates="dryer", cascade="all, delete-orphan")
+    rollups = relationship("DryerLogRollup", back_populates="dryer", cascade="all, delete-orphan")
     preset_associations = relationship("DryerPresetAssociation", back_populates="dryer", cascade="all, delete-orphan")
     servo = relationship("ServoConfig", uselist=False, back_populates="dryer", cascade="all, delete-orphan")
     led = relationship("LedConfig", uselist=False, back_populates="dryer", cascade="all, delete-orphan")
@@ -93,6 +93,17 @@ class DryerLogBase(BaseModel):
     absolute_humidity: float
     relative_humidity: float
     time_left_drying: Optional[int] = Field(None, description="Estimated seconds remaining (if applicable)")
+    # Sub-interval summary (TELEMETRY_PERSIST_INTERVAL > 0); scalar readings above are the last sample
+    samples: Optional[int] = Field(None, description="Control-loop samples summarised by this row")
+    temperature_min: Optional[float] = None
+    temperature_max: Optional[float] = None
+    temperature_mean: Optional[float] = None
+    relative_humidity_min: Optional[float] = None
+    relative_humidity_max: Optional[float] = None
+    relative_humidity_mean: Optional[float] = None
+    heater_temperature_min: Optional[float] = None
+    heater_temperature_max: Optional[float] = None
+    heater_temperature_mean: Optional[float] = None
 
 
 class DryerLog(DryerLogBase):
@@ -100,4 +111,21 @@ class DryerLog(DryerLogBase):
     id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class DryerLogRollup(DryerLog):
+    """Rollup bucket shaped as a `DryerLog` for long-range history.
+
+    Scalar readings carry bucket means and booleans the majority state;
+    `timestamp` is the bucket start and `id` is negative so it never collides
+    with raw log ids.
+    """
+    resolution: int = Field(..., description="Bucket width in seconds")
+    samples: int
+    temperature_min: float
+    temperature_max: float
+    relative_humidity_min: float
+    relative_humidity_max: float
+    heater_duty: float = Field(..., description="Fraction of samples with the heater on")
+    servo_open_fraction: float = Field(..., description="Fraction of samples with the servo open")
@@ -0,0 +1,111 @@
+"""Desired-vs-acknowledged state cache for dryer actuators.
+
+Every actuator write (LED pixel color, heater target, servo angle) is first
+quantized and compared with the last value PyUnit asked for and the value
+Moonraker last reported. A command is emitted only when the quantized target
+changes, or when the reported state drifted away from the desired one (e.g.
+after a Klipper restart). Heater fan speed is tracked as acknowledged state
+only; it is driven by Klipper itself.
+
+Quantization and deadbands are configurable per actuator kind via env vars:
+* LED_COLOR_QUANTUM (default 1/255, the resolution of 8-bit LED drivers)
+* HEATER_TARGET_QUANTUM (default 0.1 degC) / HEATER_TARGET_DEADBAND (default 0)
+* SERVO_ANGLE_QUANTUM (default 1 degree)
+* FAN_SPEED_QUANTUM (default 0.01)
+"""
+
+import os
+from typing import Any, Dict, Optional, Tuple
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+# kind -> (quantum, deadband)
+ACTUATOR_QUANTIZATION: Dict[str, Tuple[float, float]] = {
+    "led": (_env_float("LED_COLOR_QUANTUM", 1 / 255), 0.0),
+    "heater": (_env_float("HEATER_TARGET_QUANTUM", 0.1), _env_float("HEATER_TARGET_DEADBAND", 0.0)),
+    "servo": (_env_float("SERVO_ANGLE_QUANTUM", 1), 0.0),
+    "fan": (_env_float("FAN_SPEED_QUANTUM", 0.01), 0.0),
+}
+
+
+def quantize(value: Any, quantum: float) -> Any:
+    """Round a scalar or tuple of scalars to the nearest multiple of `quantum`."""
+    if isinstance(value, (tuple, list)):
+        return tuple(quantize(v, quantum) for v in value)
+    if quantum <= 0:
+        return value
+    return round(round(value / quantum) * quantum, 6)
+
+
+def _distance(a: Any, b: Any) -> float:
+    if isinstance(a, tuple):
+        return max(abs(x - y) for x, y in zip(a, b))
+    return abs(a - b)
+
+
+class Actuator_state(object):
+    """Desired / acknowledged value pair of a single actuator plus write counters."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.quantum, self.deadband = ACTUATOR_QUANTIZATION[kind]
+        self.desired: Any = None
+        self.acknowledged: Any = None
+        self.writes = 0
+        self.suppressed = 0
+
+    def in_sync(self) -> bool:
+        """True when the reported value matches the desired one within half a quantum."""
+        if self.desired is None or self.acknowledged is None:
+            return False
+        return _distance(self.desired, self.acknowledged) <= self.quantum / 2 + 1e-9
+
+
+class Actuator_state_cache(object):
+    """Per-dryer registry of `Actuator_state` entries keyed by actuator id."""
+
+    def __init__(self):
+        self.entries: Dict[str, Actuator_state] = {}
+
+    def _entry(self, key: str, kind: str) -> Actuator_state:
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = Actuator_state(kind)
+            self.entries[key] = entry
+        return entry
+
+    def request(self, key: str, kind: str, value: Any) -> Optional[Any]:
+        """Register a desired value; return the quantized value to send or None if suppressed."""
+        entry = self._entry(key, kind)
+        target = quantize(value, entry.quantum)
+        if entry.desired is not None and _distance(target, entry.desired) <= entry.deadband and entry.in_sync():
+            entry.suppressed += 1
+            return None
+        entry.desired = target
+        entry.writes += 1
+        return target
+
+    def acknowledge(self, key: str, kind: str, value: Any) -> None:
+        """Record the state last reported by Moonraker (None = unknown)."""
+        entry = self._entry(key, kind)
+        entry.acknowledged = quantize(value, entry.quantum) if value is not None else None
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Forget desired state so the next request is always written."""
+        for entry_key, entry in self.entries.items():
+            if key is None or entry_key == key:
+                entry.desired = None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Aggregate write / suppressed counters by actuator kind."""
+        result: Dict[str, Dict[str, int]] = {}
+        for entry in self.entries.values():
+            kind_stats = result.setdefault(entry.kind, {"actuators": 0, "writes": 0, "suppressed": 0})
+            kind_stats["actuators"] += 1
+            kind_stats["writes"] += entry.writes
+            kind_stats["suppressed"] += entry.suppressed
+        return result
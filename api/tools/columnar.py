@@ -0,0 +1,134 @@
+"""Compact columnar encoding of dryer log frames (dashboard websockets, format=columnar).
+
+Row JSON repeats every key name for every sample; a columnar frame sends one
+array per field instead:
+
+* `t` - epoch milliseconds (UTC), delta-encoded (first value absolute)
+* `id` - log ids, delta-encoded
+* `dryer_id`, `current_preset_id`, `time_left_drying` - plain arrays (null allowed)
+* `heater_temperature`, `temperature`, `absolute_humidity`,
+  `relative_humidity` - fixed-point integers (value * `scale`)
+* `state` - bit-packed: bit 0 heater_is_on, bit 1 heater_fan_is_run,
+  bit 2 servo_is_open, bits 3+ index into `statuses`
+
+Optional columns are present only when a row of the block carries them
+(null where a row does not): `samples` and the rollup `resolution` as plain
+integers, the interval / bucket summaries (`temperature_min`, ...,
+`heater_temperature_mean`) as fixed-point integers like the readings, and
+the rollup `heater_duty` / `servo_open_fraction` as fixed-point integers
+of `fraction_scale`.
+
+History frames carry the block in place of the row list ({"history": {...}},
+{"history_chunk": {...}, "seq", "done"}); live frames are {"columns": {...}}.
+Frames are serialised without whitespace. Decoding: running sums restore
+`t` and `id`, readings are divided by `scale`.
+"""
+
+import json
+from datetime import datetime, timedelta, timezone
+from typing import List, Sequence
+from api.schemas import dryer_schema
+from api.tools.log_rows import Log_rows
+
+COLUMNAR_SCALE = 100
+COLUMNAR_FIELDS = ("heater_temperature", "temperature", "absolute_humidity", "relative_humidity")
+COLUMNAR_FRACTION_SCALE = 10000
+# Optional columns (summary rows, rollup buckets)
+OPTIONAL_INT_FIELDS = ("samples", "resolution")
+OPTIONAL_FIXED_FIELDS = tuple(
+    f"{field}_{stat}"
+    for field in ("temperature", "relative_humidity", "heater_temperature")
+    for stat in ("min", "max", "mean")
+)
+OPTIONAL_FRACTION_FIELDS = ("heater_duty", "servo_open_fraction")
+MESSAGE_FORMATS = ("json", "columnar")
+
+_STATUSES = [status.value for status in dryer_schema.DryerLogStatus]
+_STATUS_CODES = {status: code for code, status in enumerate(dryer_schema.DryerLogStatus)}
+_EPOCH = datetime(1970, 1, 1)
+_MILLISECOND = timedelta(milliseconds=1)
+
+
+def _epoch_ms(timestamp: datetime) -> int:
+    # Log timestamps are naive UTC
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _MILLISECOND
+
+
+def _delta(values: Sequence[int]) -> List[int]:
+    previous = 0
+    out = []
+    for value in values:
+        out.append(value - previous)
+        previous = value
+    return out
+
+
+# DryerLog fields a columnar block is built from
+_SOURCE_FIELDS = ("timestamp", "id", "dryer_id", "current_preset_id", "time_left_drying", "status",
+                  "heater_is_on", "heater_fan_is_run", "servo_is_open") + COLUMNAR_FIELDS
+
+
+_OPTIONAL_FIELDS = OPTIONAL_INT_FIELDS + OPTIONAL_FIXED_FIELDS + OPTIONAL_FRACTION_FIELDS
+
+
+def encode_columns(logs: Sequence[dryer_schema.DryerLog]) -> dict:
+    """Encode chronological logs (or rollup buckets) as one columnar block (see module docstring)."""
+    values = {field: [getattr(log, field) for log in logs] for field in _SOURCE_FIELDS}
+    for field in _OPTIONAL_FIELDS:
+        values[field] = [getattr(log, field, None) for log in logs]
+    return _encode(values, len(logs))
+
+
+def encode_rows(rows: Log_rows) -> dict:
+    """Columnar block straight from Core row tuples (all LOG_COLUMNS selected)."""
+    values = dict(zip(rows.columns, map(list, zip(*rows.rows)))) if len(rows) else {field: [] for field in _SOURCE_FIELDS}
+    return _encode(values, len(rows))
+
+
+def _fixed(values: list, scale: int) -> list:
+    return [None if value is None else round(value * scale) for value in values]
+
+
+def _encode(values: dict, n: int) -> dict:
+    columns = {
+        "n": n,
+        "scale": COLUMNAR_SCALE,
+        "statuses": _STATUSES,
+        "t": _delta([_epoch_ms(timestamp) for timestamp in values["timestamp"]]),
+        "id": _delta(values["id"]),
+        "dryer_id": values["dryer_id"],
+        "current_preset_id": values["current_preset_id"],
+        "time_left_drying": values["time_left_drying"],
+    }
+    for field in COLUMNAR_FIELDS:
+        columns[field] = [round(value * COLUMNAR_SCALE) for value in values[field]]
+    columns["state"] = [
+        (_STATUS_CODES[status] << 3) | (servo_is_open << 2) | (heater_fan_is_run << 1) | heater_is_on
+        for status, heater_is_on, heater_fan_is_run, servo_is_open in zip(
+            values["status"], values["heater_is_on"], values["heater_fan_is_run"], values["servo_is_open"])
+    ]
+    # Optional columns only when some row carries them
+    present = {field for field in _OPTIONAL_FIELDS if any(value is not None for value in values.get(field, ()))}
+    for field in OPTIONAL_INT_FIELDS:
+        if field in present:
+            columns[field] = values[field]
+    for field in OPTIONAL_FIXED_FIELDS:
+        if field in present:
+            columns[field] = _fixed(values[field], COLUMNAR_SCALE)
+    if present.intersection(OPTIONAL_FRACTION_FIELDS):
+        columns["fraction_scale"] = COLUMNAR_FRACTION_SCALE
+        for field in OPTIONAL_FRACTION_FIELDS:
+            if field in present:
+                columns[field] = _fixed(values[field], COLUMNAR_FRACTION_SCALE)
+    return columns
+
+
+def dumps_compact(frame: dict) -> str:
+    return json.dumps(frame, separators=(",", ":"))
+
+
+def columnar_frame(logs: Sequence[dryer_schema.DryerLog]) -> str:
+    """Live frame {"columns": ...} for logs broadcast by the control loop."""
+    return dumps_compact({"columns": encode_columns(logs)})
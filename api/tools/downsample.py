@@ -0,0 +1,69 @@
+"""Largest-Triangle-Three-Buckets (LTTB) downsampling of chart history.
+
+History requests carrying `max_points` are reduced server-side so payload
+size and client charting work are bounded by the point budget instead of the
+time range. Temperature and relative humidity are selected jointly (each
+normalised to its range), so one set of rows keeps the visual shape of both
+chart series. Bucket bounds and next-bucket averages are computed with NumPy
+up front; each bucket's triangle areas are evaluated as one array operation.
+"""
+
+from typing import Dict, List, Sequence
+import numpy as np
+from api.schemas import dryer_schema
+
+# Series kept visually faithful by the row selection
+LTTB_FIELDS = ("temperature", "relative_humidity")
+
+
+def lttb_indices(x: np.ndarray, ys: Sequence[np.ndarray], n_out: int) -> np.ndarray:
+    """Indices of the `n_out` points of (x, ys) chosen by LTTB (x ascending).
+
+    First and last points are always kept; with several series the triangle
+    areas of the normalised series are summed.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    xs = (x - x[0]) / ((x[-1] - x[0]) or 1.0)
+    y = np.stack([(s - s.min()) / ((s.max() - s.min()) or 1.0) for s in ys])
+    # n_out - 2 buckets between the fixed first and last point
+    edges = (np.arange(n_out - 1) * ((n - 2) / (n_out - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    # Average of the following bucket (the last point for the final bucket) via prefix sums
+    next_lo = edges[1:]
+    next_hi = np.append(edges[2:], n)
+    counts = next_hi - next_lo
+    cx = np.concatenate(([0.0], np.cumsum(xs)))
+    cy = np.concatenate((np.zeros((len(ys), 1)), np.cumsum(y, axis=1)), axis=1)
+    avg_x = (cx[next_hi] - cx[next_lo]) / counts
+    avg_y = (cy[:, next_hi] - cy[:, next_lo]) / counts
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ya = y[:, a:a + 1]
+        area = np.abs((xs[a] - avg_x[i]) * (y[:, lo:hi] - ya) - (xs[a] - xs[lo:hi]) * (avg_y[:, i:i + 1] - ya)).sum(axis=0)
+        a = lo + int(area.argmax())
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_logs(logs: List[dryer_schema.DryerLog], max_points: int) -> List[dryer_schema.DryerLog]:
+    """Reduce chronological history to at most `max_points` rows per dryer (LTTB)."""
+    by_dryer: Dict[int, List[int]] = {}
+    for i, log in enumerate(logs):
+        by_dryer.setdefault(log.dryer_id, []).append(i)
+    if all(len(rows) <= max_points for rows in by_dryer.values()):
+        return logs
+    keep: List[int] = []
+    for rows in by_dryer.values():
+        if len(rows) <= max_points:
+            keep.extend(rows)
+            continue
+        x = np.fromiter((logs[i].timestamp.timestamp() for i in rows), dtype=np.float64, count=len(rows))
+        ys = [np.fromiter((getattr(logs[i], field) for i in rows), dtype=np.float64, count=len(rows)) for field in LTTB_FIELDS]
+        keep.extend(rows[i] for i in lttb_indices(x, ys, max_points))
+    keep.sort()
+    return [logs[i] for i in keep]
@@ -7,11 +7,28 @@ status evaluation, actuator decisions, and logging.
 
 Design principles:
 * Fire-and-forget soft servo movement to avoid blocking the main update loop.
+    `SERVO_SOFT_MODE` selects how the trajectory is executed: "stepped" (one
+    SET_SERVO request per step), "script" (whole trajectory as one G-code
+    script with G4 dwells) or "macro" (stepping done by a Klipper
+    delayed_gcode loop, see config_and_macros/pyunit_offload.cfg.example).
+* LED updates are rendered as frames: the whole strip is sent as one chained
+    `SET_LED ... TRANSMIT=0` script. With `LED_BLINK_MODE=klipper` blinking
+    pixels are handed to a `_PYUNIT_BLINK_<STRIP>` Klipper macro, so steady
+    blinking costs no host traffic.
 * Idempotent update_status() methods – safe to call frequently with or without
     externally batched Moonraker query data.
 * Separation of concerns: each subsystem controller is responsible only for
     its own API calls and state derivation; orchestration logic lives in
     `Dryer_control`.
+* Actuator G-code goes through a per-dryer `Gcode_batcher`: commands issued
+    during a tick are coalesced per object and sent as one script at the end
+    of the tick, while safety commands (heater off) bypass the batch.
+* Writes are filtered through a per-dryer `Actuator_state_cache`: targets are
+    quantized and only sent when they change or Moonraker reports drift.
+* Each dryer has its own polling cadence derived from its status (fast while
+    drying, slow when pending / in storage), boosted back to the fast rate
+    while the heater is commanded, a servo move runs or readings change
+    quickly. `StatusWorker` only queries and updates dryers that are due.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,20 +36,54 @@ from typing import Optional, cast
 from api.schemas import dryer_schema
 from api.schemas import preset_schema
 from api.logger import get_logger
-from api.tools.moonraker_api import Moonraker_api
+from api.tools.moonraker_api import Moonraker_api, Gcode_batcher
+from api.tools.actuator_state import Actuator_state_cache, ACTUATOR_QUANTIZATION, quantize
+from api.tools.telemetry_recorder import Telemetry_recorder, Sample_aggregator
+from api.tools.telemetry_buffer import Telemetry_buffer
+from api.tools.telemetry_record import Telemetry_record
+from api.config import DRYER_UPDATE_DEADLINE
+from fastapi import HTTPException, status
 import asyncio
+import os
+import time
 from api.database import get_db
-from api.cruds.dryer_crud import dryer_crud
+from api.cruds.dryer_crud import dryer_crud, _parse_time
+from api.cruds.rollup_crud import pick_resolution
 from simple_pid import PID
 from collections import deque
 import statistics
-from datetime import datetime
+from datetime import datetime, timedelta
 import json
 from api.cruds.preset_crud import preset_crud
+from api.cruds.config_cache import config_cache
+from api.workers.telemetry_writer import telemetryWriter
 
 
 logger = get_logger("dryer")
 
+SERVO_SOFT_MODE = os.getenv("SERVO_SOFT_MODE", "stepped").lower()
+LED_BLINK_MODE = os.getenv("LED_BLINK_MODE", "host").lower()
+
+DRYER_POLL_ACTIVE = float(os.getenv("DRYER_POLL_ACTIVE", "1"))
+DRYER_POLL_STORAGE = float(os.getenv("DRYER_POLL_STORAGE", "5"))
+DRYER_POLL_IDLE = float(os.getenv("DRYER_POLL_IDLE", "10"))
+DRYER_POLL_BOOST_SECONDS = float(os.getenv("DRYER_POLL_BOOST_SECONDS", "30"))
+DRYER_BOOST_TEMPERATURE_DELTA = float(os.getenv("DRYER_BOOST_TEMPERATURE_DELTA", "0.5"))
+DRYER_BOOST_HUMIDITY_DELTA = float(os.getenv("DRYER_BOOST_HUMIDITY_DELTA", "1.0"))
+# Seconds of readings the humidity median filter spans
+HUMIDITY_MEDIAN_SECONDS = 5
+# Real readings a humidity plateau window must hold; caps the interval of controlling dryers
+DRYER_PLATEAU_MIN_SAMPLES = int(os.getenv("DRYER_PLATEAU_MIN_SAMPLES", "6"))
+
+# Polling interval (seconds) per dryer status
+DRYER_POLL_INTERVALS = {
+    dryer_schema.DryerLogStatus.PENDING: DRYER_POLL_IDLE,
+    dryer_schema.DryerLogStatus.DRYING: DRYER_POLL_ACTIVE,
+    dryer_schema.DryerLogStatus.TIMER_DRYING: DRYER_POLL_ACTIVE,
+    dryer_schema.DryerLogStatus.HUMIDITY_STORAGE: DRYER_POLL_STORAGE,
+    dryer_schema.DryerLogStatus.TEMPERATURE_STORAGE: DRYER_POLL_STORAGE,
+}
+
 class Servo_control(object):
     """Servo control with fire-and-forget soft movement.
 
@@ -43,9 +94,12 @@ class Servo_control(object):
     - DB should log desired_is_open to avoid None constraint violations
     """
 
-    def __init__(self, moonraker_api: Moonraker_api, servo: dryer_schema.ServoConfig):
+    def __init__(self, moonraker_api: Moonraker_api, servo: dryer_schema.ServoConfig, gcode_batcher: Gcode_batcher, actuator_state: Actuator_state_cache):
         self.servo = servo
         self.moonraker_api = moonraker_api
+        self.gcode_batcher = gcode_batcher
+        self.actuator_state = actuator_state
+        self.state_key = f"servo:{' '.join(self.servo.name.split(' ')[1:])}"
         self.close_pulse_width: Optional[float] = None
         self.open_pulse_width: Optional[float] = None
         self.current_pulse_width: Optional[float] = None
@@ -88,6 +142,22 @@ class Servo_control(object):
         await self._ensure_initialized()
         self.external_data = external_data
         self.current_pulse_width = await self._get_status()
+        self._acknowledge_angle()
+
+    def is_moving(self) -> bool:
+        """True while a soft move runs or the servo sits between its endpoints."""
+        if self._soft_task is not None and not self._soft_task.done():
+            return True
+        return self.physical_is_open is None
+
+    def _acknowledge_angle(self):
+        # Only the calibrated endpoints map a pulse width back to a known angle
+        if self.current_pulse_width == self.open_pulse_width:
+            self.actuator_state.acknowledge(self.state_key, "servo", self.servo.open_angle)
+        elif self.current_pulse_width == self.close_pulse_width:
+            self.actuator_state.acknowledge(self.state_key, "servo", self.servo.close_angle)
+        else:
+            self.actuator_state.acknowledge(self.state_key, "servo", None)
 
     async def _get_close_and_open_pulse_width(self):
         await self._set_angle(self.servo.open_angle)
@@ -108,16 +178,13 @@ class Servo_control(object):
 
     async def _set_angle(self, angle: int):
         servo_name = " ".join(self.servo.name.split(" ")[1:])
+        if self.actuator_state.request(self.state_key, "servo", angle) is None:
+            return True
         gcode = f"SET_SERVO SERVO={servo_name} ANGLE={angle}"
-        result = await self.moonraker_api.send_gcode(gcode=gcode)
+        # Sent immediately: the new position is confirmed with a status read below
+        result = await self.gcode_batcher.send(gcode, key=self.state_key, immediate=True)
         if result['success']:
-            self.current_pulse_width = await self._get_status()
-            if self.current_pulse_width == self.open_pulse_width:
-                self.physical_is_open = True
-            elif self.current_pulse_width == self.close_pulse_width:
-                self.physical_is_open = False
-            else:
-                self.physical_is_open = None
+            await self._refresh_position()
             self._last_commanded_angle = angle
             logger.debug(
                 "Servo angle set name=%s angle=%s pulse=%s phys_is_open=%s desired_is_open=%s",
@@ -127,20 +194,111 @@ class Servo_control(object):
             logger.error("Servo angle set FAILED name=%s angle=%s response=%s", self.servo.name, angle, result)
             return result['success']
 
+    async def _refresh_position(self):
+        """Re-read the pulse width and derive physical_is_open from the endpoints."""
+        self.current_pulse_width = await self._get_status()
+        self._acknowledge_angle()
+        if self.current_pulse_width == self.open_pulse_width:
+            self.physical_is_open = True
+        elif self.current_pulse_width == self.close_pulse_width:
+            self.physical_is_open = False
+        else:
+            self.physical_is_open = None
+
+    def _trajectory(self, start_angle: int, target_angle: int) -> list[int]:
+        """Intermediate angles from start (exclusive) to target (inclusive)."""
+        step = self.servo.soft_step
+        angles = []
+        angle = start_angle
+        while angle != target_angle:
+            angle = min(angle + step, target_angle) if target_angle > angle else max(angle - step, target_angle)
+            angles.append(angle)
+        return angles or [target_angle]
+
+    async def _script_move(self, start_angle: int, target_angle: int):
+        """Send the whole trajectory as one script with G4 dwells, then confirm once.
+
+        Klipper executes a script to completion and G4 holds its G-code queue
+        for the dwell, so a retarget is queued behind the running move and
+        starts from its target angle.
+        """
+        servo_name = " ".join(self.servo.name.split(" ")[1:])
+        angles = self._trajectory(start_angle, target_angle)
+        dwell_ms = int(self.servo.soft_sleep * 1000)
+        lines = []
+        for angle in angles:
+            if lines and dwell_ms > 0:
+                lines.append(f"G4 P{dwell_ms}")
+            lines.append(f"SET_SERVO SERVO={servo_name} ANGLE={angle}")
+        duration = self.servo.soft_sleep * (len(angles) - 1)
+        self._last_commanded_angle = target_angle
+        self.actuator_state.request(self.state_key, "servo", target_angle)
+        try:
+            result = await self.gcode_batcher.send("\n".join(lines), key=self.state_key, immediate=True, timeout=duration + 10)
+            if not result['success']:
+                logger.error("Servo script move FAILED name=%s target=%s response=%s", self.servo.name, target_angle, result)
+                return
+            await self._refresh_position()
+            logger.info(
+                "Servo script move complete name=%s steps=%s final_angle=%s desired_is_open=%s physical_is_open=%s",
+                self.servo.name, len(angles), target_angle, self.desired_is_open, self.physical_is_open
+            )
+        except asyncio.CancelledError:
+            logger.debug("Servo script move canceled name=%s", self.servo.name)
+            raise
+        except Exception as e:
+            logger.error("Servo script move error name=%s target=%s error=%s", self.servo.name, target_angle, e)
+
+    async def _macro_move(self, start_angle: Optional[int], target_angle: int):
+        """Hand the move to the `_PYUNIT_SERVO_<name>` Klipper macro, confirm once.
+
+        The macro steps from its own last angle, so a retarget only updates its
+        target. `start_angle` is passed only when the position is known.
+        """
+        servo_name = " ".join(self.servo.name.split(" ")[1:])
+        gcode = f"_PYUNIT_SERVO_{servo_name.upper()} TARGET={target_angle} STEP={self.servo.soft_step} DWELL={self.servo.soft_sleep:.3f}"
+        if start_angle is not None:
+            gcode += f" START={start_angle}"
+        estimate_from = start_angle if start_angle is not None else self._last_commanded_angle
+        steps = len(self._trajectory(estimate_from, target_angle)) if estimate_from is not None else 1
+        self._last_commanded_angle = target_angle
+        self.actuator_state.request(self.state_key, "servo", target_angle)
+        try:
+            result = await self.gcode_batcher.send(gcode, key=self.state_key, immediate=True)
+            if not result['success']:
+                logger.error("Servo macro move FAILED name=%s target=%s response=%s", self.servo.name, target_angle, result)
+                return
+            await asyncio.sleep(self.servo.soft_sleep * (steps + 1) + 0.5)
+            await self._refresh_position()
+            logger.info(
+                "Servo macro move complete name=%s final_angle=%s desired_is_open=%s physical_is_open=%s",
+                self.servo.name, target_angle, self.desired_is_open, self.physical_is_open
+            )
+        except asyncio.CancelledError:
+            logger.debug("Servo macro move confirmation canceled name=%s", self.servo.name)
+            raise
+        except Exception as e:
+            logger.error("Servo macro move error name=%s target=%s error=%s", self.servo.name, target_angle, e)
+
     async def _soft_set_angle(self, target_angle: int):
         """Fire-and-forget smooth move to target_angle.
 
         - Cancels previous soft task.
         - Leaves desired_is_open as previously set by open()/close().
         - physical_is_open updates only when pulse equals endpoints.
-        - Guarantees final _set_angle(target_angle) call.
+        - Stepped mode guarantees a final _set_angle(target_angle) call; script
+          and macro modes confirm the move with a single final status read.
         """
-        if self._soft_task and not self._soft_task.done():
+        in_flight = self._soft_task is not None and not self._soft_task.done()
+        if in_flight:
             self._soft_task.cancel()
             logger.debug("Servo soft move canceled previous task name=%s new_target=%s", self.servo.name, target_angle)
 
         # Derive start angle
-        if self.current_pulse_width == self.open_pulse_width:
+        if in_flight and SERVO_SOFT_MODE == "script" and self._last_commanded_angle is not None:
+            # The running script still completes on the Klipper side
+            start_angle = self._last_commanded_angle
+        elif self.current_pulse_width == self.open_pulse_width:
             start_angle = self.servo.open_angle
         elif self.current_pulse_width == self.close_pulse_width:
             start_angle = self.servo.close_angle
@@ -193,7 +351,14 @@ class Servo_control(object):
             except Exception as e:
                 logger.error("Servo soft move worker error name=%s target=%s error=%s", self.servo.name, target_angle, e)
 
-        self._soft_task = asyncio.create_task(_worker())
+        if SERVO_SOFT_MODE == "script":
+            self._soft_task = asyncio.create_task(self._script_move(start_angle, target_angle))
+        elif SERVO_SOFT_MODE == "macro":
+            at_endpoint = self.current_pulse_width in (self.open_pulse_width, self.close_pulse_width)
+            known_start = start_angle if at_endpoint and not in_flight else None
+            self._soft_task = asyncio.create_task(self._macro_move(known_start, target_angle))
+        else:
+            self._soft_task = asyncio.create_task(_worker())
         def _done(task: asyncio.Task):
             if task.cancelled():
                 return
@@ -205,32 +370,59 @@ class Servo_control(object):
 class Led_pixel_control(object):
     """Represents a single addressable LED pixel with convenience color setter."""
 
-    def __init__(self, led_name: str, index: int, red: int, green: int, blue: int, moonraker_api: Moonraker_api):
+    def __init__(self, led_name: str, index: int, red: int, green: int, blue: int, gcode_batcher: Gcode_batcher):
         self.index = index + 1
         self.red = red
         self.green = green
         self.blue = blue
         self.led_name = " ".join(led_name.split(" ")[1:])
-        self.moonraker_api = moonraker_api
+        self.gcode_batcher = gcode_batcher
 
     async def set_color(self, red: int, green: int, blue: int):
         self.red = red
         self.green = green
         self.blue = blue
-        await self.moonraker_api.send_gcode(f"SET_LED LED={self.led_name} INDEX={self.index} RED={red} GREEN={green} BLUE={blue}")
+        await self.gcode_batcher.send(
+            f"SET_LED LED={self.led_name} INDEX={self.index} RED={red} GREEN={green} BLUE={blue}",
+            key=f"led:{self.led_name}:{self.index}"
+        )
 
 class Led_control(object):
-    """Manages an LED strip (group of pixels) including brightness scaling."""
+    """Manages an LED strip (group of pixels) including brightness scaling.
+
+    Pixel colors set between `begin_frame()` and `commit_frame()` are rendered
+    as one frame: changed pixels go out in a single script of chained
+    `SET_LED ... TRANSMIT=0` commands, the last one transmitting the strip.
+    Blinking pixels are toggled by the host each second, or in klipper blink
+    mode described to the `_PYUNIT_BLINK_<STRIP>` macro whenever the set of
+    blinking pixels changes (falls back to host blinking if the macro is not
+    configured).
+    """
 
-    def __init__(self, moonraker_api: Moonraker_api, led: dryer_schema.LedConfig):
+    def __init__(self, moonraker_api: Moonraker_api, led: dryer_schema.LedConfig, gcode_batcher: Gcode_batcher, actuator_state: Actuator_state_cache):
         self.led = led
         self.moonraker_api = moonraker_api
+        self.gcode_batcher = gcode_batcher
+        self.actuator_state = actuator_state
         self.pixels: list[Led_pixel_control] = []
         self.default_color: list = [0.01, 0.01, 0.01]
         self.off_color: list = [0, 0, 0]
         self.external_data: dict = None
+        self.strip_name = " ".join(self.led.name.split(" ")[1:])
+        self.blink_macro = f"_PYUNIT_BLINK_{self.strip_name.upper()}"
+        self.blink_offload = False
+        self._blink_reported: Optional[list] = None
+        self._blink_phase_on = True
+        self._frame: Optional[dict] = None
+        self._frame_blink: dict = {}
         logger.debug("Led_control created name=%s", self.led.name)
 
+    def status_objects(self) -> list[str]:
+        """Printer objects read for this strip (plus the blink macro in klipper mode)."""
+        if LED_BLINK_MODE == "klipper":
+            return [self.led.name, f"gcode_macro {self.blink_macro}"]
+        return [self.led.name]
+
     async def _ensure_initialized(self):
         if len(self.pixels) == 0:
             self.pixels = await self._get_pixels()
@@ -240,46 +432,133 @@ class Led_control(object):
     async def update_status(self, external_data: dict = None):
         await self._ensure_initialized()
         self.external_data = external_data
-        self.pixels = await self._get_pixels()
-
-    async def set_pixel_color(self, index: int, red: int, green: int, blue: int):
+        result = await self._get_status()
+        if len(result) != len(self.pixels):
+            self.pixels = self._build_pixels(result)
+        blinking = self._blinking_indexes()
+        # Update reported colors in place; they are the acknowledged state
+        for pixel, color in zip(self.pixels, result):
+            pixel.red, pixel.green, pixel.blue = color[0], color[1], color[2]
+            if pixel.index not in blinking:
+                self.actuator_state.acknowledge(self._state_key(pixel), "led", (pixel.red, pixel.green, pixel.blue))
+
+    def _blinking_indexes(self) -> set:
+        # Pixels currently driven by the Klipper blink loop
+        if not self.blink_offload or not self._blink_reported:
+            return set()
+        return {entry[0] for entry in self._blink_reported}
+
+    def _state_key(self, pixel: "Led_pixel_control") -> str:
+        return f"led:{pixel.led_name}:{pixel.index}"
+
+    def begin_frame(self):
+        """Start collecting pixel colors for one strip update."""
+        self._frame = {}
+        self._frame_blink = {}
+        self._blink_phase_on = datetime.now().second % 2 == 1
+
+    async def set_pixel_color(self, index: int, red: int, green: int, blue: int, blink: bool = False):
+        """Set a pixel (0-based) color scaled by brightness; `blink` toggles it with off each second."""
         await self._ensure_initialized()
+        single = self._frame is None
+        if single:
+            self.begin_frame()
         index = index + 1
         brightness = self.led.brightness / 100
-        red = red * brightness
-        green = green * brightness
-        blue = blue * brightness
+        color = (red * brightness, green * brightness, blue * brightness)
+        if blink and self.blink_offload:
+            self._frame_blink[index] = quantize(color, ACTUATOR_QUANTIZATION["led"][0])
+        elif blink and not self._blink_phase_on:
+            self._frame[index] = tuple(self.off_color)
+        else:
+            self._frame[index] = color
+        if single:
+            await self.commit_frame()
+
+    async def commit_frame(self):
+        """Send the changed pixels of the current frame as one chained SET_LED script."""
+        frame, frame_blink = self._frame or {}, self._frame_blink
+        self._frame = None
+        self._frame_blink = {}
+        lines = []
+        if self.blink_offload:
+            lines.extend(self._render_blink(frame_blink))
+        led_lines = []
         for pixel in self.pixels:
-            if pixel.index == index:
-                if pixel.red != red or pixel.green != green or pixel.blue != blue:
-                    await pixel.set_color(red=red, green=green, blue=blue)
-                break
+            color = frame.get(pixel.index)
+            if color is None or pixel.index in frame_blink:
+                continue
+            color = self.actuator_state.request(self._state_key(pixel), "led", color)
+            if color is None:
+                continue
+            pixel.red, pixel.green, pixel.blue = color
+            led_lines.append(f"SET_LED LED={self.strip_name} INDEX={pixel.index} RED={color[0]} GREEN={color[1]} BLUE={color[2]} TRANSMIT=0")
+        if led_lines:
+            led_lines[-1] = led_lines[-1][:-len("TRANSMIT=0")] + "TRANSMIT=1"
+            lines.extend(led_lines)
+        if lines:
+            await self.gcode_batcher.send("\n".join(lines))
+
+    def _render_blink(self, frame_blink: dict) -> list[str]:
+        """G-code updating the Klipper blink loop when the blinking pixel set changed."""
+        desired = [[index, *color] for index, color in sorted(frame_blink.items())]
+        if desired == self._blink_reported:
+            return []
+        # Pixels leaving the blink loop must be written by the host again
+        for entry in self._blink_reported or []:
+            if entry[0] not in frame_blink:
+                self.actuator_state.invalidate(f"led:{self.strip_name}:{entry[0]}")
+        self._blink_reported = desired
+        # SET_GCODE_VARIABLE values are Python literals that must not contain spaces
+        value = json.dumps(desired, separators=(",", ":"))
+        logger.debug("LED blink loop update name=%s pixels=%s", self.led.name, value)
+        return [
+            f"SET_GCODE_VARIABLE MACRO={self.blink_macro} VARIABLE=pixels VALUE={value}",
+            self.blink_macro,
+        ]
 
     async def _get_pixels(self):
-        result = await self._get_status()
+        return self._build_pixels(await self._get_status())
+
+    def _build_pixels(self, result: list):
         pixels = []
         for i in range(len(result)):
             red = result[i][0]
             green = result[i][1]
             blue = result[i][2]
-            pixels.append(Led_pixel_control(self.led.name, i, red, green, blue, self.moonraker_api))
+            pixels.append(Led_pixel_control(self.led.name, i, red, green, blue, self.gcode_batcher))
         return pixels
 
     async def _get_status(self):
         if self.external_data == None:
-            url = f"{self.moonraker_api.url}/printer/objects/query?{self.led.name}"
+            url = f"{self.moonraker_api.url}/printer/objects/query?{'&'.join(self.status_objects())}"
             result = await self.moonraker_api.call_api(url)
         else:
             result = self.external_data
             self.external_data = None
-        return result['data']['result']['status'][self.led.name]['color_data']
+        status_data = result['data']['result']['status']
+        if LED_BLINK_MODE == "klipper":
+            self._read_blink_macro(status_data)
+        return status_data[self.led.name]['color_data']
+
+    def _read_blink_macro(self, status_data: dict):
+        macro = status_data.get(f"gcode_macro {self.blink_macro}")
+        available = macro is not None
+        if available != self.blink_offload:
+            if available:
+                logger.info("LED blink offloaded to Klipper macro name=%s macro=%s", self.led.name, self.blink_macro)
+            else:
+                logger.warning("LED blink macro %s not found, blinking from host name=%s", self.blink_macro, self.led.name)
+            self.blink_offload = available
+        self._blink_reported = macro.get("pixels") if available else None
 
 class Heater_fan_control(object):
     """Encapsulates heater fan speed / run-state queries."""
 
-    def __init__(self, moonraker_api: Moonraker_api, fan: dryer_schema.HeaterConfig):
+    def __init__(self, moonraker_api: Moonraker_api, fan: dryer_schema.HeaterConfig, actuator_state: Actuator_state_cache):
         self.fan = fan
         self.moonraker_api = moonraker_api
+        self.actuator_state = actuator_state
         self.speed: float = None
         self.is_run: bool = None
         self.external_data: dict = None
@@ -290,6 +569,7 @@ class Heater_fan_control(object):
         self.external_data = external_data
         self.speed = await self._get_status()
         self.is_run = await self._is_run_status(self.speed)
+        self.actuator_state.acknowledge(f"fan:{self.fan.fan_name}", "fan", self.speed)
 
     async def _ensure_initialized(self):
         if self.speed == None:
@@ -314,15 +594,18 @@ class Heater_fan_control(object):
 class Heater_control(object):
     """Provides heater temperature / power state management and setpoint changes."""
 
-    def __init__(self, moonraker_api: Moonraker_api, heater: dryer_schema.HeaterConfig):
+    def __init__(self, moonraker_api: Moonraker_api, heater: dryer_schema.HeaterConfig, gcode_batcher: Gcode_batcher, actuator_state: Actuator_state_cache):
         self.heater = heater
         self.moonraker_api = moonraker_api
+        self.gcode_batcher = gcode_batcher
+        self.actuator_state = actuator_state
+        self.state_key = f"heater:{' '.join(self.heater.name.split(' ')[1:])}"
         self.max_temperature: float = None
         self.temperature: float = 0
         self.power: float = 0
         self.target: float = 0
         self.is_on: bool = None
-        self.fan = Heater_fan_control(self.moonraker_api, self.heater)
+        self.fan = Heater_fan_control(self.moonraker_api, self.heater, self.actuator_state)
         self.external_data: dict = None
         logger.debug("Heater_control created name=%s", self.heater.name)
 
@@ -336,13 +619,18 @@ class Heater_control(object):
         self.target = result['target']
         self.power = round(result['power'], 2)
         self.is_on = await self._is_on_status(result['power'])
+        self.actuator_state.acknowledge(self.state_key, "heater", self.target)
 
     async def set(self, target: float):
         await self._ensure_initialized()
         heater_name = " ".join(self.heater.name.split(" ")[1:])
-        if target <= self.max_temperature and self.target != target:
+        if target <= self.max_temperature:
+            target = self.actuator_state.request(self.state_key, "heater", target)
+            if target is None:
+                return
             gcode = f"SET_HEATER_TEMPERATURE HEATER={heater_name} TARGET={target}"
-            await self.moonraker_api.send_gcode(gcode=gcode)
+            # Heater off is a safety command and never waits for the tick batch
+            await self.gcode_batcher.send(gcode, key=self.state_key, immediate=target == 0)
 
     async def _ensure_initialized(self):
         if self.temperature == None or self.target == None:
@@ -376,8 +664,10 @@ class Heater_control(object):
 class Temperature_and_humidity_control(object):
     """Tracks temperature & humidity metrics, computing derived statistics.
 
-    Maintains rolling deques plus real-time median filters used for plateau
-    detection and control decisions.
+    Maintains rolling time windows plus real-time median filters used for
+    plateau detection and control decisions. Windows are sized in seconds
+    (median over HUMIDITY_MEDIAN_SECONDS, plateau over `plateau_duration`),
+    so they cover the same wall time whatever the dryer's sampling cadence.
     """
 
     def __init__(self, moonraker_api: Moonraker_api, sensor: dryer_schema.TemperatureConfig, plateau_duration: int):
@@ -386,14 +676,12 @@ class Temperature_and_humidity_control(object):
         self.temperature = None
         self.relative_humidity = None
         self.absolute_humidity = None
-        self.median_relative_humidity_filter = self.RealTimeMedianFilter(5)
+        self.median_relative_humidity_filter = self.RealTimeMedianFilter(HUMIDITY_MEDIAN_SECONDS)
         self.median_relative_humidity = None
-        self.median_absolute_humidity_filter = self.RealTimeMedianFilter(5)
+        self.median_absolute_humidity_filter = self.RealTimeMedianFilter(HUMIDITY_MEDIAN_SECONDS)
         self.median_absolute_humidity = None
-        self.relative_humidity_values: deque = deque(
-            maxlen=plateau_duration)
-        self.absolute_humidity_values: deque = deque(
-            maxlen=plateau_duration)
+        self.relative_humidity_values = self.TimedWindow(plateau_duration)
+        self.absolute_humidity_values = self.TimedWindow(plateau_duration)
         self.external_data: dict = None
         logger.debug("TempHum_control created sensor=%s", self.sensor.sensor_name)
 
@@ -404,7 +692,8 @@ class Temperature_and_humidity_control(object):
             self.relative_humidity = result['humidity']
             self.absolute_humidity = await self._get_absolute_humidity()
 
-    async def update_status(self, external_data: dict = None):
+    async def update_status(self, external_data: dict = None, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
         await self._ensure_initialized()
         self.external_data = external_data
         result = await self._get_status()
@@ -412,12 +701,12 @@ class Temperature_and_humidity_control(object):
         self.relative_humidity = round(result['humidity'], 1)
         self.absolute_humidity = await self._get_absolute_humidity()
         self.median_relative_humidity = float(
-            self.median_relative_humidity_filter.update(self.relative_humidity))
+            self.median_relative_humidity_filter.update(self.relative_humidity, now))
         self.median_absolute_humidity = float(
-            self.median_absolute_humidity_filter.update(self.absolute_humidity))
+            self.median_absolute_humidity_filter.update(self.absolute_humidity, now))
 
-        self.relative_humidity_values.append(self.median_relative_humidity)
-        self.absolute_humidity_values.append(self.median_absolute_humidity)
+        self.relative_humidity_values.append(self.median_relative_humidity, now)
+        self.absolute_humidity_values.append(self.median_absolute_humidity, now)
 
     async def _get_status(self):
         if self.external_data == None:
@@ -437,16 +726,61 @@ class Temperature_and_humidity_control(object):
         return absolute_humidity_rounded
 
     class RealTimeMedianFilter:
-        """Simple fixed-size median filter for streaming values."""
+        """Median of the values streamed during the last `window_seconds` (monotonic time)."""
+
+        def __init__(self, window_seconds):
+            self.window_seconds = window_seconds
+            self.window = deque()
+
+        def update(self, new_value, now):
+            self.window.append((now, new_value))
+            # Half a second of slack keeps exactly `window_seconds` samples at 1 Hz despite jitter
+            while now - self.window[0][0] > self.window_seconds - 0.5:
+                self.window.popleft()
+            median_value = statistics.median(value for _, value in self.window)
+            return median_value
 
-        def __init__(self, window_size):
-            self.window_size = window_size
-            self.window = deque(maxlen=window_size)
+    class TimedWindow:
+        """Timestamped values covering the last `duration` seconds.
 
-        def update(self, new_value):
-            self.window.append(new_value)
-            median_value = statistics.median(self.window)
-            return median_value
+        `series` resamples them to one value per second ending at the newest
+        sample, the grid plateau detection works on: a sample within half a
+        second of a grid point is taken as is (so 1 Hz or faster sampling
+        yields the sampled values), sparser samples are linearly interpolated.
+        """
+
+        def __init__(self, duration):
+            self.duration = duration
+            self.samples = deque()
+
+        def append(self, value, now):
+            self.samples.append((now, value))
+            # Keep one sample at or before the first grid point
+            first = now - (self.duration - 1)
+            while len(self.samples) > 1 and self.samples[1][0] <= first:
+                self.samples.popleft()
+
+        def series(self) -> Optional[list]:
+            """`duration` per-second values ending at the newest sample, or None until the window is filled."""
+            if self.duration < 1 or not self.samples:
+                return None
+            first = self.samples[-1][0] - (self.duration - 1)
+            if self.samples[0][0] > first + 0.5:
+                return None
+            samples = list(self.samples)
+            values = []
+            i = 0
+            for k in range(self.duration):
+                t = first + k
+                while i + 1 < len(samples) and samples[i + 1][0] <= t:
+                    i += 1
+                t0, v0 = samples[i]
+                if i + 1 == len(samples) or t - t0 <= 0.5:
+                    values.append(v0)
+                    continue
+                t1, v1 = samples[i + 1]
+                values.append(v1 if t1 - t <= 0.5 else v0 + (v1 - v0) * (t - t0) / (t1 - t0))
+            return values
 
 class Heater_PID(object):
     """Wrapper around PID for heater temperature control with dynamic limits."""
@@ -501,7 +835,9 @@ class Dryer_control(object):
     * Initialize subsystem controllers
     * Periodically gather batched Moonraker state
     * Apply control algorithms (servo hysteresis, PID loops, storage modes)
-    * Persist telemetry logs
+    * Persist telemetry logs (via the batched `telemetryWriter`, change-only
+      when TELEMETRY_RECORD_MODE=change)
+    * Keep recent telemetry in memory (`telemetry_buffer`) for dashboard history
     * Manage preset-driven state machine transitions
     """
 
@@ -511,6 +847,11 @@ class Dryer_control(object):
         self.current_preset: Optional[preset_schema.Preset] = None
         self.db: Optional[AsyncSession] = None
         self.moonraker_api: Optional[Moonraker_api] = None
+        self.gcode_batcher: Optional[Gcode_batcher] = None
+        self.actuator_state = Actuator_state_cache()
+        self.telemetry_recorder = Telemetry_recorder()
+        self.sample_aggregator = Sample_aggregator()
+        self.telemetry_buffer = Telemetry_buffer(id)
         # Fully typed dryer_config; populated in initialize()
         self.dryer_config: Optional[dryer_schema.Dryer] = None
         self.servo: Optional[Servo_control] = None
@@ -523,6 +864,18 @@ class Dryer_control(object):
         self.temperature_and_humidity: Optional[Temperature_and_humidity_control] = None
         # Servo control hysteresis helpers
         self._servo_last_action: Optional[datetime] = None
+        # Ticks skipped by StatusWorker because update_status missed its deadline
+        self.update_task: Optional[asyncio.Task] = None
+        self.busy_skips: int = 0
+        self.deadline_missed: bool = False
+        self.deadline_misses: int = 0
+        self.deadline_misses_total: int = 0
+        # Adaptive polling cadence (time.monotonic() based)
+        self.next_poll_at: float = 0.0
+        self._boost_until: float = 0.0
+        self._last_sample: Optional[tuple] = None
+        # config_cache.version the current preset was last checked against
+        self._config_version: Optional[int] = None
         logger.info("Dryer instance created id=%s status=%s", self.id, self.status)
 
     async def initialize(self):
@@ -535,21 +888,182 @@ class Dryer_control(object):
             self.dryer_config = cast(dryer_schema.Dryer, await dryer_crud.get_dryer_config(session, self.id))
             # Defensive assertion to narrow Optional types for subsequent attribute access
             assert self.dryer_config and self.dryer_config.config, "Dryer config not loaded"
-            self.servo = Servo_control(self.moonraker_api, self.dryer_config.config.servo)
-            self.led = Led_control(self.moonraker_api, self.dryer_config.config.led)
-            self.heater = Heater_control(self.moonraker_api, self.dryer_config.config.heater)
+            self.gcode_batcher = Gcode_batcher(self.moonraker_api)
+            self.servo = Servo_control(self.moonraker_api, self.dryer_config.config.servo, self.gcode_batcher, self.actuator_state)
+            self.led = Led_control(self.moonraker_api, self.dryer_config.config.led, self.gcode_batcher, self.actuator_state)
+            self.heater = Heater_control(self.moonraker_api, self.dryer_config.config.heater, self.gcode_batcher, self.actuator_state)
             self.temperature_and_humidity = Temperature_and_humidity_control(
                 self.moonraker_api,
                 self.dryer_config.config.temperature,
                 self.dryer_config.config.humidity.plateau_duration
             )
+            self.moonraker_api.subscribe_objects(self.status_objects())
+            # Recent history is served from memory; seed it with what is already stored
+            since = datetime.utcnow() - timedelta(hours=self.telemetry_buffer.hours)
+            recent_logs = await dryer_crud.get_logs(session, dryer_id=self.id, start_time=since.isoformat())
+            self.telemetry_buffer.prefill(recent_logs, since)
             logger.info("Dryer initialize done id=%s servo=%s led=%s heater=%s", self.id, self.servo.servo.name, self.led.led.name, self.heater.heater.name)
 
-    async def update_status(self, fast: bool = True) -> json:
+    def runtime_stats(self) -> dict:
+        """Runtime counters for diagnostics (actuator write suppression, G-code batching)."""
+        return {
+            "dryer_id": self.id,
+            "status": self.status,
+            "actuators": self.actuator_state.stats(),
+            "gcode": {
+                "scripts_sent": self.gcode_batcher.scripts_sent if self.gcode_batcher else 0,
+                "coalesced": self.gcode_batcher.coalesced if self.gcode_batcher else 0,
+            },
+            "deadline": {
+                "missed": self.deadline_missed,
+                "consecutive_misses": self.deadline_misses,
+                "total_misses": self.deadline_misses_total,
+                "busy_skips": self.busy_skips,
+            },
+            "cadence": {
+                "interval": self.poll_interval(),
+                "boosted": self._boost_until > time.monotonic(),
+            },
+            "telemetry": self.telemetry_recorder.stats(),
+            "buffer": self.telemetry_buffer.stats(),
+        }
+
+    def get_recent_logs(self, start_time: Optional[str] = None, end_time: Optional[str] = None,
+                        limit: Optional[int] = None, max_points: Optional[int] = None) -> Optional[list[dryer_schema.DryerLog]]:
+        """History from the in-memory telemetry buffer (same shape as `dryer_crud.get_history`).
+
+        Returns None when the range is not fully buffered or `max_points`
+        calls for rollups; the caller then reads the database.
+        """
+        if not start_time:
+            return None
+        start = _parse_time(start_time)
+        end = _parse_time(end_time) if end_time else None
+        if pick_resolution(((end or datetime.utcnow()) - start).total_seconds(), max_points):
+            return None
+        return self.telemetry_buffer.query(start, end, limit)
+
+    def poll_interval(self, now: Optional[float] = None) -> float:
+        """Seconds between control ticks for the current status (active rate while boosted).
+
+        Humidity windows are time-based, so a slower cadence keeps their span
+        but holds fewer readings: outside PENDING the interval is capped so
+        one plateau_duration window holds DRYER_PLATEAU_MIN_SAMPLES readings
+        (interpolated in between). The HUMIDITY_MEDIAN_SECONDS median then
+        spans a single reading at storage cadence (no smoothing), which is
+        intended: storage humidity moves slowly and the plateau moving
+        average still smooths it.
+        """
+        now = time.monotonic() if now is None else now
+        interval = DRYER_POLL_INTERVALS.get(self.status, DRYER_POLL_ACTIVE)
+        if self._boost_until > now:
+            interval = min(interval, DRYER_POLL_ACTIVE)
+        if self.status != dryer_schema.DryerLogStatus.PENDING and self.dryer_config:
+            plateau_duration = self.dryer_config.config.humidity.plateau_duration
+            if plateau_duration > 0:
+                interval = min(interval, max(plateau_duration / DRYER_PLATEAU_MIN_SAMPLES, DRYER_POLL_ACTIVE))
+        return interval
+
+    def is_due(self, now: Optional[float] = None) -> bool:
+        """True when the next control tick of this dryer is due."""
+        now = time.monotonic() if now is None else now
+        return now >= self.next_poll_at
+
+    def _schedule_next_poll(self):
+        now = time.monotonic()
+        sample = (self.temperature_and_humidity.temperature, self.temperature_and_humidity.relative_humidity)
+        reason = None
+        if self.servo.is_moving():
+            reason = "servo"
+        elif self.heater.target:
+            reason = "heater"
+        elif self._last_sample is not None and (
+            abs(sample[0] - self._last_sample[0]) >= DRYER_BOOST_TEMPERATURE_DELTA
+            or abs(sample[1] - self._last_sample[1]) >= DRYER_BOOST_HUMIDITY_DELTA
+        ):
+            reason = "change"
+        self._last_sample = sample
+        if reason is not None:
+            if self._boost_until <= now:
+                logger.debug("Dryer cadence boost id=%s reason=%s", self.id, reason)
+            self._boost_until = now + DRYER_POLL_BOOST_SECONDS
+        self.next_poll_at = now + self.poll_interval(now)
+
+    def status_objects(self) -> list[str]:
+        """Moonraker printer objects read by this dryer every tick."""
+        config = self.dryer_config.config
+        return [config.servo.name, *self.led.status_objects(), config.heater.name, config.heater.fan_name, config.temperature.sensor_name]
+
+    async def update_status(self, fast: bool = True, external_data: dict = None) -> Optional[Telemetry_record]:
+        """Run one control tick.
+
+        `external_data` is this dryer's slice of a combined Moonraker query
+        (see `StatusWorker`); without it the dryer queries its own objects.
+        Returns the record to broadcast, or None while a persist interval
+        is still collecting samples.
+        """
         logger.debug("Dryer update_status start id=%s fast=%s status=%s preset=%s", self.id, fast, self.status, getattr(self.current_preset, 'id', None))
+        # Actuator commands issued during the tick leave as one script at its end
+        self.gcode_batcher.begin()
+        try:
+            await self._control_tick(fast, external_data)
+            await self.gcode_batcher.flush()
+        finally:
+            self.gcode_batcher.discard()
+        self._schedule_next_poll()
+        # Validated once here; the telemetry writer assigns the id
+        log_data = dryer_schema.DryerLog(
+            id = 0,
+            dryer_id = self.id,
+            current_preset_id=self.current_preset.id if self.current_preset else None,
+            status = self.status,
+            timestamp = datetime.utcnow(),
+            heater_temperature = self.heater.temperature,
+            heater_is_on = self.heater.is_on,
+            heater_fan_is_run = self.heater.fan.is_run,
+            temperature = self.temperature_and_humidity.temperature,
+            servo_is_open = self.servo.desired_is_open,
+            absolute_humidity = self.temperature_and_humidity.absolute_humidity,
+            relative_humidity = self.temperature_and_humidity.relative_humidity,
+            time_left_drying = int(self.time_left_drying) if self.time_left_drying is not None else None
+        )
+        logger.debug(
+            "Dryer update_status done id=%s temp=%.2f target=%.2f power=%.2f hum=%.2f relHum=%.2f servoOpen=%s heaterOn=%s fanRun=%s",
+            self.id,
+            self.heater.temperature,
+            self.heater.target,
+            self.heater.power,
+            self.temperature_and_humidity.absolute_humidity,
+            self.temperature_and_humidity.relative_humidity,
+            self.servo.desired_is_open,
+            self.heater.is_on,
+            self.heater.fan.is_run
+        )
+        # With TELEMETRY_PERSIST_INTERVAL samples are folded into one summary row per interval
+        log_data = self.sample_aggregator.add(log_data)
+        if log_data is None:
+            return None
+        # Persisted in batches by the telemetry writer; the record is broadcast right away.
+        # Samples inside the recording deadband only feed the rollups.
+        persist = self.telemetry_recorder.should_record(log_data)
+        record = await telemetryWriter.submit(log_data, persist=persist)
+        self.telemetry_buffer.append(record.log)
+        return record
+
+    async def _control_tick(self, fast: bool, external_data: Optional[dict]):
+        """Refresh subsystem state, reload preset changes and apply actuator targets."""
         if fast == True:
-            url = f"{self.moonraker_api.url}/printer/objects/query?{self.dryer_config.config.servo.name}&{self.dryer_config.config.led.name}&{self.dryer_config.config.heater.name}&{self.dryer_config.config.heater.fan_name}&{self.dryer_config.config.temperature.sensor_name}&"
-            result = await self.moonraker_api.call_api(url)
+            if external_data is not None:
+                result = external_data
+            else:
+                # Only the read is bounded: it precedes every state change of the tick
+                try:
+                    result = await asyncio.wait_for(self.moonraker_api.query_objects(self.status_objects()), timeout=DRYER_UPDATE_DEADLINE)
+                except asyncio.TimeoutError:
+                    raise HTTPException(
+                        status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                        detail="Moonraker status query timeout"
+                    )
             await self.servo.update_status(result)
             await self.led.update_status(result)
             await self.heater.update_status(result)
@@ -561,11 +1075,13 @@ class Dryer_control(object):
             await self.temperature_and_humidity.update_status()
         
         await self._update_led()
-        if self.current_preset != None:
+        # Presets / links only change through CRUD writes, which bump the cache version
+        if self.current_preset != None and self._config_version != config_cache.version:
+            self._config_version = config_cache.version
             self.db = get_db()
             async for session in self.db:
-                preset_link = await preset_crud.get_preset_link(session, self.current_preset.id, self.id)
-                current_preset = await preset_crud.get_preset(session, self.current_preset.id)
+                preset_link = await preset_crud.get_preset_link_cached(session, self.current_preset.id, self.id)
+                current_preset = await preset_crud.get_preset_cached(session, self.current_preset.id)
                 if current_preset == None or preset_link == None:
                     logger.warning("Dryer preset missing id=%s preset=%s -> status pending", self.id, getattr(self.current_preset, 'id', None))
                     await self.set_status(dryer_schema.DryerLogStatus.PENDING)
@@ -580,40 +1096,12 @@ class Dryer_control(object):
                         logger.info("Dryer preset reloaded id=%s preset=%s", self.id, self.current_preset.id)
 
         await self._apply_actuator_targets()
-        self.db = get_db()
-        log_data = dryer_schema.DryerLogBase(
-            dryer_id = self.id,
-            current_preset_id=self.current_preset.id if self.current_preset else None,
-            status = self.status,
-            timestamp = datetime.utcnow(),
-            heater_temperature = self.heater.temperature,
-            heater_is_on = self.heater.is_on,
-            heater_fan_is_run = self.heater.fan.is_run,
-            temperature = self.temperature_and_humidity.temperature,
-            servo_is_open = self.servo.desired_is_open,
-            absolute_humidity = self.temperature_and_humidity.absolute_humidity,
-            relative_humidity = self.temperature_and_humidity.relative_humidity,
-            time_left_drying = int(self.time_left_drying) if self.time_left_drying is not None else None
-        )
-        async for session in self.db:
-            result = await dryer_crud.add_log(session, log_data)
-            logger.debug(
-                "Dryer update_status done id=%s temp=%.2f target=%.2f power=%.2f hum=%.2f relHum=%.2f servoOpen=%s heaterOn=%s fanRun=%s",
-                self.id,
-                self.heater.temperature,
-                self.heater.target,
-                self.heater.power,
-                self.temperature_and_humidity.absolute_humidity,
-                self.temperature_and_humidity.relative_humidity,
-                self.servo.desired_is_open,
-                self.heater.is_on,
-                self.heater.fan.is_run
-            )
-            return result.json()
 
     async def set_status(self, status: dryer_schema.DryerLogStatus, preset: preset_schema.Preset = None):
         previous = self.status
         self.status = status
+        # Status changes take effect on the next worker tick, whatever the cadence
+        self.next_poll_at = 0.0
         logger.info("Status change id=%s %s -> %s preset=%s", self.id, previous, self.status, getattr(preset, 'id', None))
         if self.status == dryer_schema.DryerLogStatus.PENDING:
             self.current_preset = None
@@ -644,11 +1132,7 @@ class Dryer_control(object):
 
     async def _update_led(self):
         # LED logic is frequent; keep as debug-level summary only.
-        current_second = datetime.now().second
-        if current_second % 2 == 0:
-            leds_is_on = False
-        else:
-            leds_is_on = True
+        self.led.begin_frame()
 
         #Heater
         if self.heater.is_on == True:
@@ -657,32 +1141,27 @@ class Dryer_control(object):
             await self.led.set_pixel_color(0, *self.led.default_color)
         #Heater fan
         if self.heater.fan.is_run == True:
-            if self.status == dryer_schema.DryerLogStatus.HUMIDITY_STORAGE and leds_is_on == False:
-                await self.led.set_pixel_color(1, *self.led.off_color)
-            else:
-                await self.led.set_pixel_color(1, 0, self.heater.fan.speed, 0)
+            blink = self.status == dryer_schema.DryerLogStatus.HUMIDITY_STORAGE
+            await self.led.set_pixel_color(1, 0, self.heater.fan.speed, 0, blink=blink)
         if self.heater.fan.is_run == False:
             await self.led.set_pixel_color(1, *self.led.default_color)
         #Humidity
         if self.current_preset != None:
-            if (self.status == dryer_schema.DryerLogStatus.TIMER_DRYING or self.status == dryer_schema.DryerLogStatus.HUMIDITY_STORAGE or self.status == dryer_schema.DryerLogStatus.TEMPERATURE_STORAGE) and leds_is_on == False:
-                await self.led.set_pixel_color(2, *self.led.off_color)
+            blink = self.status == dryer_schema.DryerLogStatus.TIMER_DRYING or self.status == dryer_schema.DryerLogStatus.HUMIDITY_STORAGE or self.status == dryer_schema.DryerLogStatus.TEMPERATURE_STORAGE
+            if self.temperature_and_humidity.median_relative_humidity < self.current_preset.humidity:
+                await self.led.set_pixel_color(2, *self.led.default_color, blink=blink)
             else:
-                if self.temperature_and_humidity.median_relative_humidity < self.current_preset.humidity:
-                    await self.led.set_pixel_color(2, *self.led.default_color)
-                else:
-                    await self.led.set_pixel_color(2, 0, 0, self.temperature_and_humidity.median_relative_humidity / 100)
+                await self.led.set_pixel_color(2, 0, 0, self.temperature_and_humidity.median_relative_humidity / 100, blink=blink)
         else:
             await self.led.set_pixel_color(2, *self.led.default_color)
         #Temperature
-        if self.status == dryer_schema.DryerLogStatus.TEMPERATURE_STORAGE and leds_is_on == False:
-            await self.led.set_pixel_color(3, *self.led.off_color)
+        blink = self.status == dryer_schema.DryerLogStatus.TEMPERATURE_STORAGE
+        if self.temperature_and_humidity.temperature <= 50:
+            await self.led.set_pixel_color(3, *self.led.default_color, blink=blink)
         else:
-            if self.temperature_and_humidity.temperature <= 50:
-                await self.led.set_pixel_color(3, *self.led.default_color)
-            else:
-                await self.led.set_pixel_color(3, (self.heater.temperature/(self.heater.max_temperature/100))/100, 0, 0)
-        logger.debug("LED update applied id=%s leds_on=%s heater_on=%s fan=%s servo_open=%s", self.id, leds_is_on, self.heater.is_on, self.heater.fan.is_run, self.servo.desired_is_open)
+            await self.led.set_pixel_color(3, (self.heater.temperature/(self.heater.max_temperature/100))/100, 0, 0, blink=blink)
+        await self.led.commit_frame()
+        logger.debug("LED update applied id=%s blink_offload=%s heater_on=%s fan=%s servo_open=%s", self.id, self.led.blink_offload, self.heater.is_on, self.heater.fan.is_run, self.servo.desired_is_open)
 
     async def _apply_actuator_targets(self):
         # Decide and apply control outputs based on status
@@ -814,13 +1293,13 @@ class Dryer_control(object):
 
     async def _servo_control(self):
         humidity_cfg = self.dryer_config.config.humidity
-        humidity_values = self.temperature_and_humidity.relative_humidity_values
-        required = humidity_cfg.plateau_duration
-        if len(humidity_values) != required:
+        # Per-second humidity over the last plateau_duration seconds
+        values_list = self.temperature_and_humidity.relative_humidity_values.series()
+        if values_list is None:
             return
+        required = len(values_list)
 
         window = humidity_cfg.plateau_window_size
-        values_list = list(humidity_values)
         smoothed_values = [
             self.moving_average(values_list[i:i + window])
             for i in range(required - window + 1)
@@ -0,0 +1,84 @@
+"""Streaming export of stored dryer logs (CSV / NDJSON, optionally gzip).
+
+`export_chunks` walks a dryer's logs in (timestamp, id) order with keyset
+pages of EXPORT_CHUNK_SIZE rows (`dryer_crud.get_log_page`). Each page is
+read in its own short session, so an export of millions of rows never holds
+a read transaction (and the WAL snapshot it pins) across the whole download,
+and memory stays at one page whatever the range. Pages are encoded as they
+arrive and, with gzip, compressed incrementally into one gzip member.
+"""
+
+import asyncio
+import csv
+import io
+import json
+import os
+import zlib
+from datetime import datetime
+from typing import AsyncIterator, Optional, Sequence
+from api.cruds.dryer_crud import dryer_crud
+from api.database import get_db
+from api.logger import get_logger
+from api.tools.log_rows import Log_rows, LOG_COLUMNS
+
+logger = get_logger("log_export")
+
+EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "2000"))
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _csv_rows(rows: Log_rows) -> list:
+    # Timestamps in ISO form, like the JSON encodings
+    if "timestamp" not in rows.columns:
+        return rows.rows
+    position = rows.columns.index("timestamp")
+    return [
+        row[:position] + (row[position].isoformat(),) + row[position + 1:] if isinstance(row[position], datetime) else row
+        for row in rows.rows
+    ]
+
+
+def encode_chunk(rows: Log_rows, export_format: str, header: bool = False) -> str:
+    """Text of one page: CSV lines (with the column header first if `header`) or NDJSON lines."""
+    if export_format == "ndjson":
+        return "".join(json.dumps(item) + "\n" for item in rows.dicts())
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    if header:
+        writer.writerow(rows.columns)
+    writer.writerows(_csv_rows(rows))
+    return out.getvalue()
+
+
+def _encode_page(rows: Log_rows, export_format: str, header: bool, compressor) -> bytes:
+    data = encode_chunk(rows, export_format, header).encode()
+    return compressor.compress(data) if compressor else data
+
+
+async def export_chunks(dryer_id: int, export_format: str = "csv", columns: Optional[Sequence[str]] = None,
+                        start_time: Optional[str] = None, end_time: Optional[str] = None,
+                        compress: bool = False, chunk_size: int = EXPORT_CHUNK_SIZE) -> AsyncIterator[bytes]:
+    """Yield the export body of a dryer's logs chunk by chunk (oldest first)."""
+    columns = tuple(columns or LOG_COLUMNS)
+    # wbits 31: gzip container
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    after = None
+    first = True
+    total = 0
+    while True:
+        async for session in get_db():
+            rows, after = await dryer_crud.get_log_page(
+                session, dryer_id, chunk_size, after=after, start_time=start_time,
+                end_time=end_time, columns=columns
+            )
+        total += len(rows)
+        # Encoding (and compressing) a page is CPU work; keep it off the event loop
+        data = await asyncio.to_thread(_encode_page, rows, export_format, first, compressor)
+        first = False
+        if data:
+            yield data
+        if after is None:
+            break
+    if compressor:
+        yield compressor.flush()
+    logger.debug("export dryer_id=%s format=%s gzip=%s rows=%d", dryer_id, export_format, compress, total)
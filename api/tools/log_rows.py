@@ -0,0 +1,73 @@
+"""Plain-tuple dryer_logs rows from the Core SQL fast path.
+
+`dryer_crud.get_log_rows` / `stream_log_rows` select only the requested
+columns with a Core `select()` and hand back `Log_rows`: the column names
+plus one tuple per row, oldest first. Wire encodings are built straight from
+the tuples (`dicts` for row JSON, `api.tools.columnar.encode_rows`) with no
+ORM objects, identity map or per-row pydantic model in between.
+
+Pages of `dryer_crud.get_log_page` continue from the (timestamp, id) key of
+the previous page, handed to clients as an opaque cursor (`encode_cursor`).
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+from api.schemas import dryer_schema
+
+# Every dryer_logs column, in DryerLog field order (the JSON row of a log)
+LOG_COLUMNS = tuple(dryer_schema.DryerLog.model_fields)
+# Unique sort key of stored logs (keyset pagination)
+LOG_KEY = ("timestamp", "id")
+
+
+def encode_cursor(key: Tuple[datetime, int]) -> str:
+    """Opaque page cursor for a (timestamp, id) key."""
+    timestamp, log_id = key
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{log_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """(timestamp, id) key of a cursor from `encode_cursor` (None if malformed)."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, log_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), int(log_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+class Log_rows(object):
+    """Column names plus row tuples (values as typed by the DB driver)."""
+
+    __slots__ = ("columns", "rows")
+
+    def __init__(self, columns: Sequence[str], rows: List[tuple]):
+        self.columns = tuple(columns)
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index: slice) -> "Log_rows":
+        return Log_rows(self.columns, self.rows[index])
+
+    def dicts(self) -> List[dict]:
+        """JSON-ready row objects (timestamps as ISO strings, like `DryerLog.json()`)."""
+        columns = self.columns
+        if "timestamp" not in columns:
+            return [dict(zip(columns, row)) for row in self.rows]
+        position = columns.index("timestamp")
+        out = []
+        for row in self.rows:
+            item = dict(zip(columns, row))
+            timestamp = row[position]
+            if isinstance(timestamp, datetime):
+                item["timestamp"] = timestamp.isoformat()
+            out.append(item)
+        return out
+
+    def column(self, name: str) -> list:
+        position = self.columns.index(name)
+        return [row[position] for row in self.rows]
@@ -4,6 +4,18 @@ Provides helper methods for common Moonraker endpoints plus generic GET / POST
 logic that converts network / protocol errors into HTTPExceptions suitable for
 FastAPI routes. All successful calls return a dict with shape:
 { "success": bool, "data": <raw json from moonraker> }
+
+HTTP traffic goes through `moonrakerSessionPool`: one long-lived
+`aiohttp.ClientSession` per Moonraker base URL with a keep-alive connector, so
+status queries and G-code writes reuse TCP connections instead of paying a
+fresh connect per request. The pool is closed by the application lifespan.
+
+With `MOONRAKER_TRANSPORT=websocket` the pool also keeps one JSON-RPC
+WebSocket per host (`Moonraker_websocket`). It subscribes to the status
+objects used by the configured dryers, keeps an in-memory copy updated from
+`notify_status_update` diffs and carries G-code scripts as pipelined
+requests. Status reads are then served from memory; HTTP is used whenever the
+socket is down.
 """
 
 from api.cruds.moonraker_config_crud import moonraker_crud
@@ -11,12 +23,297 @@ from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 import aiohttp
 import asyncio
+import os
 from api.schemas import dryer_schema
 from api.logger import get_logger
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional
 
 logger = get_logger("moonraker_api")
 
+# Connection pool tuning (per Moonraker host)
+MOONRAKER_CONNECTION_LIMIT = int(os.getenv("MOONRAKER_CONNECTION_LIMIT", "8"))
+MOONRAKER_KEEPALIVE_TIMEOUT = float(os.getenv("MOONRAKER_KEEPALIVE_TIMEOUT", "60"))
+MOONRAKER_DNS_CACHE_TTL = int(os.getenv("MOONRAKER_DNS_CACHE_TTL", "300"))
+# "http" (polling) or "websocket" (push subscriptions + cached status)
+MOONRAKER_TRANSPORT = os.getenv("MOONRAKER_TRANSPORT", "http").strip().lower()
+
+# Attributes actually read by the dryer controllers, keyed by Klipper object
+# type. Unknown object types are queried without a selector (all attributes).
+MOONRAKER_OBJECT_ATTRIBUTES: Dict[str, list[str]] = {
+    "heater_generic": ["temperature", "target", "power"],
+    "heater_bed": ["temperature", "target", "power"],
+    "extruder": ["temperature", "target", "power"],
+    "heater_fan": ["speed"],
+    "fan": ["speed"],
+    "fan_generic": ["speed"],
+    "controller_fan": ["speed"],
+    "temperature_fan": ["speed"],
+    "neopixel": ["color_data"],
+    "dotstar": ["color_data"],
+    "led": ["color_data"],
+    "pca9533": ["color_data"],
+    "pca9632": ["color_data"],
+    "servo": ["value"],
+    "sht3x": ["temperature", "humidity"],
+    "bme280": ["temperature", "humidity"],
+    "htu21d": ["temperature", "humidity"],
+    "aht10": ["temperature", "humidity"],
+}
+
+
+def object_attributes(name: str) -> Optional[list[str]]:
+    """Return the attribute selector for a printer object (None = all attributes)."""
+    return MOONRAKER_OBJECT_ATTRIBUTES.get(name.split(" ")[0])
+
+
+def slice_status(result: Dict[str, Any], objects: Iterable[str]) -> Dict[str, Any]:
+    """Extract `objects` from a combined query result, keeping the response shape."""
+    status_data = result['data']['result']['status']
+    return {"success": True, "data": {"result": {"status": {name: status_data[name] for name in objects if name in status_data}}}}
+
+
+class Moonraker_session_pool(object):
+    """Shared aiohttp sessions keyed by Moonraker base URL.
+
+    Each host gets its own `TCPConnector` so the connection limit applies per
+    Moonraker instance; DNS lookups are cached and idle connections are kept
+    alive between control loop ticks.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._websockets: Dict[str, "Moonraker_websocket"] = {}
+
+    def get(self, base_url: str) -> aiohttp.ClientSession:
+        """Return the pooled session for `base_url`, creating it on first use."""
+        session = self._sessions.get(base_url)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=MOONRAKER_CONNECTION_LIMIT,
+                limit_per_host=MOONRAKER_CONNECTION_LIMIT,
+                use_dns_cache=True,
+                ttl_dns_cache=MOONRAKER_DNS_CACHE_TTL,
+                keepalive_timeout=MOONRAKER_KEEPALIVE_TIMEOUT,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[base_url] = session
+            logger.debug("Moonraker session opened url=%s limit=%s", base_url, MOONRAKER_CONNECTION_LIMIT)
+        return session
+
+    def get_websocket(self, base_url: str, headers: Dict[str, str]) -> "Moonraker_websocket":
+        """Return the shared WebSocket client for `base_url`, starting it on first use."""
+        websocket = self._websockets.get(base_url)
+        if websocket is None:
+            websocket = Moonraker_websocket(base_url, headers)
+            websocket.start()
+            self._websockets[base_url] = websocket
+        return websocket
+
+    async def close(self) -> None:
+        """Close all pooled sessions (called from the application lifespan)."""
+        websockets = list(self._websockets.values())
+        self._websockets.clear()
+        for websocket in websockets:
+            await websocket.close()
+        sessions = list(self._sessions.items())
+        self._sessions.clear()
+        for base_url, session in sessions:
+            if not session.closed:
+                await session.close()
+            logger.debug("Moonraker session closed url=%s", base_url)
+
+
+class Moonraker_websocket(object):
+    """Persistent Moonraker JSON-RPC WebSocket with a subscribed status cache.
+
+    * `subscribe()` registers printer objects; one `printer.objects.subscribe`
+      covering the union of all registered objects is sent per change (and on
+      every reconnect / Klippy ready).
+    * `notify_status_update` diffs are merged into `self.status`.
+    * `call()` sends a request with a unique id and returns its result; several
+      calls may be in flight at once (responses are matched by id).
+    * The connection task reconnects with exponential backoff; while down the
+      cache is cleared so callers fall back to HTTP.
+    """
+
+    def __init__(self, base_url: str, headers: Dict[str, str]):
+        self.base_url = base_url
+        self.ws_url = base_url.replace("https://", "wss://").replace("http://", "ws://") + "/websocket"
+        self.headers = dict(headers)
+        self.status: Dict[str, Dict[str, Any]] = {}
+        self.connected = False
+        self._objects: Dict[str, Optional[list[str]]] = {}
+        self._ws: Optional[aiohttp.ClientWebSocketResponse] = None
+        self._task: Optional[asyncio.Task] = None
+        self._resubscribe_task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        self._closed = False
+
+    def start(self) -> None:
+        """Spawn the background connection task."""
+        if self._task is None or self._task.done():
+            self._closed = False
+            self._task = asyncio.create_task(self._run())
+            logger.info("Moonraker websocket starting url=%s", self.ws_url)
+
+    async def close(self) -> None:
+        """Stop the connection task and fail outstanding requests."""
+        self._closed = True
+        if self._ws is not None and not self._ws.closed:
+            await self._ws.close()
+        for task in (self._task, self._resubscribe_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._resubscribe_task = None
+        self._on_disconnect()
+        logger.info("Moonraker websocket closed url=%s", self.ws_url)
+
+    def subscribe(self, objects: Dict[str, Optional[list[str]]]) -> None:
+        """Add objects (name -> attribute list or None for all) to the subscription."""
+        changed = False
+        for name, attributes in objects.items():
+            if name not in self._objects or self._objects[name] != attributes:
+                self._objects[name] = attributes
+                changed = True
+        if changed and self.connected:
+            self._schedule_resubscribe()
+
+    def get_status(self, objects: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """Return cached status in the `call_api` response shape, or None if unavailable."""
+        if not self.connected:
+            return None
+        result: Dict[str, Any] = {}
+        for name in objects:
+            cached = self.status.get(name)
+            if cached is None:
+                return None
+            result[name] = dict(cached)
+        return {"success": True, "data": {"result": {"status": result}}}
+
+    async def call(self, method: str, params: Optional[dict] = None, timeout: float = 10) -> Any:
+        """Send a JSON-RPC request and await its result."""
+        if not self.connected or self._ws is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Moonraker websocket not connected"
+            )
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        message: Dict[str, Any] = {"jsonrpc": "2.0", "method": method, "id": request_id}
+        if params is not None:
+            message["params"] = params
+        try:
+            await self._ws.send_json(message)
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error("Websocket timeout method=%s id=%s", method, request_id)
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail="Moonraker connection timeout"
+            )
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def send_gcode(self, gcode: str, timeout: float = 10) -> Dict[str, Any]:
+        """Run a G-code script over the socket (same response shape as HTTP)."""
+        result = await self.call("printer.gcode.script", {"script": gcode}, timeout=timeout)
+        return {"success": True, "data": {"result": result}}
+
+    async def _run(self):
+        backoff = 1
+        while not self._closed:
+            try:
+                session = moonrakerSessionPool.get(self.base_url)
+                async with session.ws_connect(self.ws_url, headers=self.headers, heartbeat=30) as ws:
+                    self._ws = ws
+                    self.connected = True
+                    backoff = 1
+                    logger.info("Moonraker websocket connected url=%s", self.ws_url)
+                    self._schedule_resubscribe()
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            self._handle_message(msg.json())
+                        elif msg.type in (aiohttp.WSMsgType.ERROR, aiohttp.WSMsgType.CLOSED):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Moonraker websocket error url=%s error=%s", self.ws_url, e)
+            self._on_disconnect()
+            if self._closed:
+                break
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+
+    def _on_disconnect(self):
+        if self.connected:
+            logger.warning("Moonraker websocket disconnected url=%s", self.ws_url)
+        self.connected = False
+        self._ws = None
+        self.status.clear()
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Moonraker websocket disconnected"
+                ))
+        self._pending.clear()
+
+    def _schedule_resubscribe(self):
+        # The newest request covers every registered object; an older one still in flight is superseded
+        if self._resubscribe_task is not None and not self._resubscribe_task.done():
+            self._resubscribe_task.cancel()
+        self._resubscribe_task = asyncio.create_task(self._resubscribe())
+        self._resubscribe_task.add_done_callback(self._on_resubscribe_done)
+
+    def _on_resubscribe_done(self, task: asyncio.Task):
+        if task is self._resubscribe_task:
+            self._resubscribe_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Moonraker websocket resubscribe failed url=%s error=%s", self.ws_url, task.exception())
+
+    async def _resubscribe(self):
+        if not self._objects:
+            return
+        try:
+            result = await self.call("printer.objects.subscribe", {"objects": dict(self._objects)})
+            for name, values in result.get("status", {}).items():
+                self.status[name] = dict(values)
+            logger.debug("Moonraker websocket subscribed objects=%s", len(self._objects))
+        except Exception as e:
+            logger.warning("Moonraker websocket subscribe failed url=%s error=%s", self.ws_url, e)
+
+    def _handle_message(self, data: Dict[str, Any]):
+        request_id = data.get("id")
+        if request_id is not None:
+            future = self._pending.get(request_id)
+            if future is not None and not future.done():
+                if "error" in data:
+                    error = data["error"]
+                    future.set_exception(HTTPException(
+                        status_code=status.HTTP_502_BAD_GATEWAY,
+                        detail=f"Moonraker API returned error: {error.get('message', error)}"
+                    ))
+                else:
+                    future.set_result(data.get("result"))
+            return
+        method = data.get("method")
+        if method == "notify_status_update":
+            diff = data.get("params", [{}])[0]
+            for name, values in diff.items():
+                self.status.setdefault(name, {}).update(values)
+        elif method == "notify_klippy_ready":
+            self._schedule_resubscribe()
+        elif method in ("notify_klippy_shutdown", "notify_klippy_disconnected"):
+            self.status.clear()
+
 
 class Moonraker_api(object):
     """Lightweight async client for Moonraker endpoints.
@@ -30,6 +327,7 @@ class Moonraker_api(object):
     def __init__(self, db: AsyncSession):
         self.url: str | None = None
         self.headers: Dict[str, str] | None = None
+        self.websocket: Optional[Moonraker_websocket] = None
         self.db = db
         logger.debug("Moonraker_api instance created")
 
@@ -45,7 +343,28 @@ class Moonraker_api(object):
         self.headers = {}
         if existing_config.moonraker_api_key:
             self.headers["X-Api-Key"] = existing_config.moonraker_api_key
-        logger.debug("Moonraker initialized url=%s", self.url)
+        if MOONRAKER_TRANSPORT == "websocket":
+            self.websocket = moonrakerSessionPool.get_websocket(self.url, self.headers)
+        logger.debug("Moonraker initialized url=%s transport=%s", self.url, MOONRAKER_TRANSPORT)
+
+    def subscribe_objects(self, objects: Iterable[str]) -> None:
+        """Register status objects with the WebSocket subscription (no-op over HTTP)."""
+        if self.websocket is not None:
+            self.websocket.subscribe({name: object_attributes(name) for name in objects})
+
+    async def query_objects(self, objects: list[str]) -> Dict[str, Any]:
+        """Return status for `objects`, from the WebSocket cache when available."""
+        if self.websocket is not None:
+            cached = self.websocket.get_status(objects)
+            if cached is not None:
+                return cached
+        selectors = []
+        for name in dict.fromkeys(objects):
+            attributes = object_attributes(name)
+            selectors.append(f"{name}={','.join(attributes)}" if attributes else name)
+        url = f"{self.url}/printer/objects/query?{'&'.join(selectors)}"
+        logger.debug("query_objects %s", url)
+        return await self.call_api(url)
 
     async def get_info(self) -> Dict[str, Any]:
         url = f"{self.url}/printer/info"
@@ -66,18 +385,18 @@ class Moonraker_api(object):
         """Perform a GET request to Moonraker converting errors to HTTPException."""
         logger.debug("API call %s", url)
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, headers=self.headers, timeout=10) as response:
-                    logger.debug("API status %s %s", response.status, url)
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.debug("API ok %s", url)
-                        return {"success": True, "data": data}
-                    logger.warning("API call failed: %s status=%s", url, response.status)
-                    raise HTTPException(
-                        status_code=status.HTTP_502_BAD_GATEWAY,
-                        detail=f"Moonraker API returned error status: {response.status}"
-                    )
+            session = moonrakerSessionPool.get(self.url)
+            async with session.get(url, headers=self.headers, timeout=10) as response:
+                logger.debug("API status %s %s", response.status, url)
+                if response.status == 200:
+                    data = await response.json()
+                    logger.debug("API ok %s", url)
+                    return {"success": True, "data": data}
+                logger.warning("API call failed: %s status=%s", url, response.status)
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail=f"Moonraker API returned error status: {response.status}"
+                )
         except aiohttp.ClientConnectorError as e:
             logger.error("Connection error calling %s error=%s", url, e)
             raise HTTPException(
@@ -103,23 +422,29 @@ class Moonraker_api(object):
                 detail=f"Unexpected error communicating with Moonraker: {e}"
             )
 
-    async def send_gcode(self, gcode: str) -> Dict[str, Any]:
-        """Send a GCODE script to Moonraker."""
+    async def send_gcode(self, gcode: str, timeout: float = 10) -> Dict[str, Any]:
+        """Send a GCODE script to Moonraker (over the WebSocket when connected).
+
+        Moonraker answers only after the whole script ran, so scripts with
+        dwells (G4) need a `timeout` covering their duration.
+        """
+        if self.websocket is not None and self.websocket.connected:
+            return await self.websocket.send_gcode(gcode, timeout=timeout)
         url = f"{self.url}/printer/gcode/script"
         payload = {"script": gcode}
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload, headers=self.headers, timeout=10) as response:
-                    logger.debug("API status %s %s", response.status, url)
-                    if response.status == 200:
-                        data = await response.json()
-                        logger.debug("API ok %s", url)
-                        return {"success": True, "data": data}
-                    logger.warning("API call failed: %s status=%s", url, response.status)
-                    raise HTTPException(
-                        status_code=status.HTTP_502_BAD_GATEWAY,
-                        detail=f"Moonraker API returned error status: {response.status}"
-                    )
+            session = moonrakerSessionPool.get(self.url)
+            async with session.post(url, json=payload, headers=self.headers, timeout=timeout) as response:
+                logger.debug("API status %s %s", response.status, url)
+                if response.status == 200:
+                    data = await response.json()
+                    logger.debug("API ok %s", url)
+                    return {"success": True, "data": data}
+                logger.warning("API call failed: %s status=%s", url, response.status)
+                raise HTTPException(
+                    status_code=status.HTTP_502_BAD_GATEWAY,
+                    detail=f"Moonraker API returned error status: {response.status}"
+                )
         except aiohttp.ClientConnectorError as e:
             logger.error("Connection error calling %s error=%s", url, e)
             raise HTTPException(
@@ -146,6 +471,59 @@ class Moonraker_api(object):
             )
 
 
+class Gcode_batcher(object):
+    """Collects G-code emitted during a control tick and sends it as one script.
+
+    While a batch is open (`begin()` .. `flush()`), `send()` queues commands by
+    key (the target object); a newer command for the same key replaces the
+    queued one. `flush()` posts the queued commands as a single newline-joined
+    script. Commands sent with `immediate=True` (safety paths such as heater
+    off) or outside a batch go out at once and drop any queued command with the
+    same key.
+    """
+
+    def __init__(self, moonraker_api: Moonraker_api):
+        self.moonraker_api = moonraker_api
+        self._pending: Dict[str, str] = {}
+        self._open = False
+        self.coalesced = 0
+        self.scripts_sent = 0
+
+    def begin(self) -> None:
+        """Open a batch; subsequent non-immediate commands are queued."""
+        self._open = True
+
+    def discard(self) -> None:
+        """Close the batch dropping anything still queued (no-op after flush)."""
+        if self._pending:
+            logger.debug("Gcode batch discarded commands=%s", len(self._pending))
+        self._pending.clear()
+        self._open = False
+
+    async def send(self, gcode: str, key: Optional[str] = None, immediate: bool = False, timeout: float = 10) -> Dict[str, Any]:
+        """Queue (or send right away) a G-code command addressed to `key`."""
+        key = key or gcode
+        if immediate or not self._open:
+            self._pending.pop(key, None)
+            self.scripts_sent += 1
+            return await self.moonraker_api.send_gcode(gcode, timeout=timeout)
+        if key in self._pending:
+            del self._pending[key]
+            self.coalesced += 1
+        self._pending[key] = gcode
+        return {"success": True, "data": {"result": "queued"}}
 
+    async def flush(self) -> Optional[Dict[str, Any]]:
+        """Send queued commands as one script and close the batch."""
+        self._open = False
+        if not self._pending:
+            return None
+        script = "\n".join(self._pending.values())
+        commands = len(self._pending)
+        self._pending.clear()
+        self.scripts_sent += 1
+        logger.debug("Gcode batch flush commands=%s coalesced_total=%s", commands, self.coalesced)
+        return await self.moonraker_api.send_gcode(script)
 
 
+moonrakerSessionPool = Moonraker_session_pool()
@@ -0,0 +1,180 @@
+"""In-memory ring buffer of recent dryer telemetry.
+
+Each `Dryer_control` keeps the records it broadcast during the last
+TELEMETRY_BUFFER_HOURS hours (default 1) in a fixed-size struct-of-arrays
+ring: `array` columns of machine types (int64 epoch microseconds and ids,
+float64 readings and interval summaries, int8 flags / status codes, int32
+preset, time left and summary sample count).
+The buffer is prefilled from the database when the dryer starts, so recent
+history requests (the dashboard's 5m / 10m / 1h views) are answered from
+memory; `query` returns None when the range reaches further back than the
+buffer covers and the caller falls back to the database.
+"""
+
+import math
+import os
+from array import array
+from datetime import datetime, timedelta
+from typing import List, Optional
+from api.schemas import dryer_schema
+from api.config import RAW_SAMPLE_PERIOD
+
+TELEMETRY_BUFFER_HOURS = float(os.getenv("TELEMETRY_BUFFER_HOURS", "1"))
+
+_EPOCH = datetime(1970, 1, 1)
+_STATUSES = list(dryer_schema.DryerLogStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+_FLOAT_FIELDS = ("heater_temperature", "temperature", "absolute_humidity", "relative_humidity")
+_FLAG_FIELDS = ("heater_is_on", "heater_fan_is_run", "servo_is_open")
+# Optional ints stored with a sentinel
+_OPTIONAL_FIELDS = ("current_preset_id", "time_left_drying", "samples")
+_NONE = -1
+# Interval summaries (TELEMETRY_PERSIST_INTERVAL > 0), NaN when absent
+_SUMMARY_FIELDS = tuple(
+    f"{field}_{stat}"
+    for field in ("temperature", "relative_humidity", "heater_temperature")
+    for stat in ("min", "max", "mean")
+)
+
+
+def _to_epoch_us(timestamp: datetime) -> int:
+    delta = timestamp - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def buffer_capacity(hours: float = TELEMETRY_BUFFER_HOURS) -> int:
+    """Records needed for `hours` at the densest broadcast rate."""
+    return max(1, int(hours * 3600 / max(RAW_SAMPLE_PERIOD, 0.05)))
+
+
+class Telemetry_buffer(object):
+    """Fixed-capacity ring of `DryerLog` records for one dryer (chronological)."""
+
+    def __init__(self, dryer_id: int, capacity: Optional[int] = None, hours: float = TELEMETRY_BUFFER_HOURS):
+        self.dryer_id = dryer_id
+        self.capacity = capacity or buffer_capacity(hours)
+        self.hours = hours
+        self.size = 0
+        self._head = 0  # next write position
+        # Records are complete from this epoch on (buffer start, or oldest kept once wrapped)
+        self.complete_since_us: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.epoch_us = array('q', bytes(8 * self.capacity))
+        self.ids = array('q', bytes(8 * self.capacity))
+        self.status = array('b', bytes(self.capacity))
+        self.floats = {field: array('d', bytes(8 * self.capacity)) for field in _FLOAT_FIELDS}
+        self.flags = {field: array('b', bytes(self.capacity)) for field in _FLAG_FIELDS}
+        self.optional = {field: array('i', bytes(4 * self.capacity)) for field in _OPTIONAL_FIELDS}
+        self.summaries = {field: array('d', bytes(8 * self.capacity)) for field in _SUMMARY_FIELDS}
+
+    def prefill(self, logs: List[dryer_schema.DryerLog], since: datetime):
+        """Load stored records (chronological) covering everything since `since`."""
+        self.extend(logs)
+        if self.size < self.capacity:
+            self.complete_since_us = _to_epoch_us(since)
+
+    def append(self, log: dryer_schema.DryerLog):
+        """Add a record; must not be older than the newest one."""
+        i = self._head
+        epoch_us = _to_epoch_us(log.timestamp)
+        if self.complete_since_us is None:
+            self.complete_since_us = epoch_us
+        self.epoch_us[i] = epoch_us
+        self.ids[i] = log.id
+        self.status[i] = _STATUS_CODES[log.status]
+        for field in _FLOAT_FIELDS:
+            self.floats[field][i] = getattr(log, field)
+        for field in _FLAG_FIELDS:
+            self.flags[field][i] = bool(getattr(log, field))
+        for field in _OPTIONAL_FIELDS:
+            value = getattr(log, field)
+            self.optional[field][i] = _NONE if value is None else value
+        for field in _SUMMARY_FIELDS:
+            value = getattr(log, field)
+            self.summaries[field][i] = math.nan if value is None else value
+        self._head = (i + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+        else:
+            # Wrapped: history is now complete only from the oldest kept record
+            self.complete_since_us = self.epoch_us[self._head]
+
+    def extend(self, logs: List[dryer_schema.DryerLog]):
+        for log in logs:
+            self.append(log)
+
+    def _slot(self, n: int) -> int:
+        # Physical index of the n-th oldest record
+        return (self._head - self.size + n) % self.capacity
+
+    def _first_at_or_after(self, epoch_us: int) -> int:
+        lo, hi = 0, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.epoch_us[self._slot(mid)] < epoch_us:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def covers(self, start: datetime) -> bool:
+        """True when every record since `start` is held in memory."""
+        return self.complete_since_us is not None and _to_epoch_us(start) >= self.complete_since_us
+
+    def query(self, start: datetime, end: Optional[datetime] = None,
+              limit: Optional[int] = None) -> Optional[List[dryer_schema.DryerLog]]:
+        """Records in [start, end] (chronological, most recent `limit`), or None if not covered."""
+        if not self.covers(start):
+            self.misses += 1
+            return None
+        self.hits += 1
+        first = self._first_at_or_after(_to_epoch_us(start))
+        last = self._first_at_or_after(_to_epoch_us(end) + 1) if end else self.size
+        if limit:
+            first = max(first, last - limit)
+        if first >= last:
+            return []
+        columns = {"id": self._column(self.ids, first, last)}
+        columns["timestamp"] = [_EPOCH + timedelta(microseconds=us) for us in self._column(self.epoch_us, first, last)]
+        columns["status"] = [_STATUSES[code] for code in self._column(self.status, first, last)]
+        for field, column in self.floats.items():
+            columns[field] = self._column(column, first, last)
+        for field, column in self.flags.items():
+            columns[field] = [bool(flag) for flag in self._column(column, first, last)]
+        for field, column in self.optional.items():
+            columns[field] = [None if value == _NONE else value for value in self._column(column, first, last)]
+        for field, column in self.summaries.items():
+            columns[field] = [None if math.isnan(value) else value for value in self._column(column, first, last)]
+        fields = list(columns)
+        return [
+            dryer_schema.DryerLog(dryer_id=self.dryer_id, **dict(zip(fields, values)))
+            for values in zip(*columns.values())
+        ]
+
+    def _column(self, column: array, first: int, last: int) -> list:
+        # Logical range [first, last) as a list, in at most two contiguous slices
+        start = self._slot(first)
+        end = start + (last - first)
+        if end <= self.capacity:
+            return column[start:end].tolist()
+        return column[start:].tolist() + column[:end - self.capacity].tolist()
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "size": self.size,
+            "bytes": sum(column.itemsize * len(column) for column in self._columns()),
+            "complete_since": (_EPOCH + timedelta(microseconds=self.complete_since_us)).isoformat() if self.complete_since_us is not None else None,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _columns(self):
+        yield self.epoch_us
+        yield self.ids
+        yield self.status
+        yield from self.floats.values()
+        yield from self.flags.values()
+        yield from self.optional.values()
+        yield from self.summaries.values()
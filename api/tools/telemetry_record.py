@@ -0,0 +1,38 @@
+"""Telemetry record shared by every consumer of one control-loop sample.
+
+A sample is validated once, when `Dryer_control.update_status` builds its
+`DryerLog`; `telemetryWriter.submit` only assigns the id (attribute set, no
+re-validation) and wraps it in a `Telemetry_record`. The record serialises
+itself once with pydantic's compiled encoder (`model_dump_json`) and every
+websocket frame - the aggregated `dryers_stats` array and each
+`dryer_{id}_stats` frame - is built from that cached string, so the status
+worker never parses JSON back to route a sample.
+"""
+
+from typing import Optional, Sequence
+from api.schemas import dryer_schema
+
+
+class Telemetry_record(object):
+    """One broadcast sample: the log and its JSON, encoded on first use."""
+
+    __slots__ = ("log", "_json")
+
+    def __init__(self, log: dryer_schema.DryerLog):
+        self.log = log
+        self._json: Optional[str] = None
+
+    @property
+    def dryer_id(self) -> int:
+        return self.log.dryer_id
+
+    @property
+    def json(self) -> str:
+        if self._json is None:
+            self._json = self.log.model_dump_json()
+        return self._json
+
+
+def json_frame(records: Sequence[Telemetry_record]) -> str:
+    """Live frame '[{...},{...}]' joined from the cached record JSON."""
+    return "[" + ",".join(record.json for record in records) + "]"
@@ -0,0 +1,191 @@
+"""Telemetry sub-interval aggregation and change-only (deadband) recording.
+
+With TELEMETRY_PERSIST_INTERVAL > 0 the control loop may sample faster than
+rows are persisted (e.g. STATUS_TICK_PERIOD=0.25 with DRYER_POLL_ACTIVE=0.25):
+`Sample_aggregator` folds the samples of each interval into one log holding
+the last values plus min/max/mean of temperature, relative humidity and
+heater temperature, so spikes between persisted rows stay visible. Status or
+preset changes close the interval early. 0 (default) persists every sample.
+
+With TELEMETRY_RECORD_MODE=change a dryer persists a raw log row only when
+* a reading left its deadband around the last *recorded* row,
+* status, preset, heater / fan / servo state changed, or
+* TELEMETRY_HEARTBEAT seconds passed since the last recorded row.
+Every sample is still broadcast live and folded into the rollups; history
+reads rebuild the step-hold series (see `step_hold`). The default mode "all"
+records every sample.
+
+Deadbands (env, absolute units; interval min/max are checked as well):
+* TELEMETRY_DEADBAND_TEMPERATURE (default 0.2 degC, air temperature)
+* TELEMETRY_DEADBAND_HEATER_TEMPERATURE (default 0.5 degC)
+* TELEMETRY_DEADBAND_HUMIDITY (default 0.5 %RH)
+* TELEMETRY_DEADBAND_ABSOLUTE_HUMIDITY (default 0.1 g/m3)
+* TELEMETRY_DEADBAND_TIME_LEFT (default 60 s)
+"""
+
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from api.schemas import dryer_schema
+from api.config import STATUS_TICK_PERIOD, TELEMETRY_PERSIST_INTERVAL
+
+TELEMETRY_RECORD_MODE = os.getenv("TELEMETRY_RECORD_MODE", "all").lower()
+TELEMETRY_HEARTBEAT = float(os.getenv("TELEMETRY_HEARTBEAT", "120"))
+TELEMETRY_DEADBANDS: Dict[str, float] = {
+    "temperature": float(os.getenv("TELEMETRY_DEADBAND_TEMPERATURE", "0.2")),
+    "heater_temperature": float(os.getenv("TELEMETRY_DEADBAND_HEATER_TEMPERATURE", "0.5")),
+    "relative_humidity": float(os.getenv("TELEMETRY_DEADBAND_HUMIDITY", "0.5")),
+    "absolute_humidity": float(os.getenv("TELEMETRY_DEADBAND_ABSOLUTE_HUMIDITY", "0.1")),
+    "time_left_drying": float(os.getenv("TELEMETRY_DEADBAND_TIME_LEFT", "60")),
+}
+# Readings summarised with min/max/mean per persisted interval
+AGGREGATED_FIELDS = ("temperature", "relative_humidity", "heater_temperature")
+# Any change of these fields is recorded
+TELEMETRY_STATE_FIELDS = ("status", "current_preset_id", "heater_is_on", "heater_fan_is_run", "servo_is_open")
+# Held copies are placed this long before the next recorded change
+HOLD_LEAD = timedelta(seconds=STATUS_TICK_PERIOD)
+
+
+class Telemetry_recorder(object):
+    """Per-dryer decision whether a sample has to be persisted."""
+
+    def __init__(self, mode: str = TELEMETRY_RECORD_MODE):
+        self.mode = mode
+        self.last: Optional[dryer_schema.DryerLogBase] = None
+        self.last_at = 0.0
+        self.recorded = 0
+        self.skipped = 0
+
+    def _changed(self, log: dryer_schema.DryerLogBase) -> bool:
+        for field in TELEMETRY_STATE_FIELDS:
+            if getattr(log, field) != getattr(self.last, field):
+                return True
+        for field, deadband in TELEMETRY_DEADBANDS.items():
+            value, last = getattr(log, field), getattr(self.last, field)
+            if (value is None) != (last is None):
+                return True
+            if value is None:
+                continue
+            values = [value]
+            if field in AGGREGATED_FIELDS:
+                values += [v for v in (getattr(log, f"{field}_min"), getattr(log, f"{field}_max")) if v is not None]
+            if any(abs(v - last) > deadband for v in values):
+                return True
+        return False
+
+    def should_record(self, log: dryer_schema.DryerLogBase, now: Optional[float] = None) -> bool:
+        """True when `log` must be written; updates the last-recorded reference."""
+        now = time.monotonic() if now is None else now
+        record = (
+            self.mode != "change"
+            or self.last is None
+            or now - self.last_at >= TELEMETRY_HEARTBEAT
+            or self._changed(log)
+        )
+        if record:
+            self.last = log
+            self.last_at = now
+            self.recorded += 1
+        else:
+            self.skipped += 1
+        return record
+
+    def stats(self) -> dict:
+        return {"mode": self.mode, "recorded": self.recorded, "skipped": self.skipped}
+
+
+class Sample_aggregator(object):
+    """Folds fast control-loop samples into one log per persist interval."""
+
+    def __init__(self, interval: float = TELEMETRY_PERSIST_INTERVAL):
+        self.interval = interval
+        self.window_start: Optional[float] = None
+        self.samples = 0
+        self.last: Optional[dryer_schema.DryerLogBase] = None
+        self._min: Dict[str, float] = {}
+        self._max: Dict[str, float] = {}
+        self._sum: Dict[str, float] = {}
+
+    def add(self, log: dryer_schema.DryerLogBase, now: Optional[float] = None) -> Optional[dryer_schema.DryerLogBase]:
+        """Add a sample; return the summary of the interval it closed, else None.
+
+        The first sample at or past the interval end (or one with a new status
+        or preset) closes the running interval and opens the next one.
+        """
+        if self.interval <= 0:
+            return log
+        now = time.monotonic() if now is None else now
+        summary = None
+        if self.last is not None:
+            if now - self.window_start >= self.interval:
+                summary = self._summary()
+                # Next window on the interval grid so tick jitter does not accumulate
+                self.window_start += self.interval
+                if now - self.window_start >= self.interval:
+                    self.window_start = now
+            elif log.status != self.last.status or log.current_preset_id != self.last.current_preset_id:
+                summary = self._summary()
+                self.window_start = now
+        self._add(log, now)
+        return summary
+
+    def _add(self, log: dryer_schema.DryerLogBase, now: float):
+        if self.window_start is None:
+            self.window_start = now
+        for field in AGGREGATED_FIELDS:
+            value = getattr(log, field)
+            self._min[field] = min(self._min.get(field, value), value)
+            self._max[field] = max(self._max.get(field, value), value)
+            self._sum[field] = self._sum.get(field, 0.0) + value
+        self.samples += 1
+        self.last = log
+
+    def _summary(self) -> dryer_schema.DryerLogBase:
+        stats = {"samples": self.samples}
+        for field in AGGREGATED_FIELDS:
+            stats[f"{field}_min"] = self._min[field]
+            stats[f"{field}_max"] = self._max[field]
+            stats[f"{field}_mean"] = self._sum[field] / self.samples
+        summary = self.last.copy(update=stats)
+        self.samples = 0
+        self._min.clear()
+        self._max.clear()
+        self._sum.clear()
+        return summary
+
+
+def _hold(log: dryer_schema.DryerLog, timestamp: datetime) -> dryer_schema.DryerLog:
+    # Negative ids keep held copies distinct from stored rows on the client
+    return log.copy(update={"timestamp": timestamp, "id": -log.id})
+
+
+def step_hold(logs: List[dryer_schema.DryerLog], anchor: Optional[dryer_schema.DryerLog] = None,
+              start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[dryer_schema.DryerLog]:
+    """Rebuild a step-hold series from change-only rows (chronological input).
+
+    Each row's values are held until just before the next row of the same dryer
+    (at most TELEMETRY_HEARTBEAT later, beyond that the dryer was not running);
+    the last row is held up to `end`. `anchor` is the latest row before `start`,
+    held at `start` so the range opens with the value in force.
+    """
+    heartbeat = timedelta(seconds=TELEMETRY_HEARTBEAT)
+    result: List[dryer_schema.DryerLog] = []
+    if anchor is not None and start is not None and anchor.timestamp + heartbeat > start:
+        result.append(_hold(anchor, start))
+    previous: Dict[int, dryer_schema.DryerLog] = {}
+    for log in logs:
+        prev = previous.get(log.dryer_id)
+        if prev is not None:
+            held_at = min(log.timestamp - HOLD_LEAD, prev.timestamp + heartbeat)
+            if held_at > prev.timestamp:
+                result.append(_hold(prev, held_at))
+        result.append(log)
+        previous[log.dryer_id] = log
+    end = end or datetime.utcnow()
+    for prev in previous.values():
+        held_at = min(end, prev.timestamp + heartbeat)
+        if held_at > prev.timestamp:
+            result.append(_hold(prev, held_at))
+    result.sort(key=lambda log: log.timestamp)
+    return result
@@ -7,10 +7,12 @@ or all active connections. Dead/broken connections are pruned during broadcast
 with lightweight debug logging.
 
 Supports dynamic channels like dryer_{id}_stats for per-dryer subscriptions.
+Connections may negotiate a message format (e.g. "columnar"); `broadcast`
+then sends them that encoding, built once per broadcast.
 """
 
 from fastapi import WebSocket
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
 import logging
 
 logger = logging.getLogger(__name__)
@@ -36,8 +38,10 @@ class WebSocketConnectionManager:
         self.dryers_stats_connections: List[WebSocket] = []
         # Dynamic channels (key = channel name, value = list of websockets)
         self.dynamic_channels: Dict[str, List[WebSocket]] = {}
+        # Negotiated message format per connection (absent = "json")
+        self.message_formats: Dict[WebSocket, str] = {}
 
-    async def connect(self, websocket: WebSocket, connection_type: str = "general"):
+    async def connect(self, websocket: WebSocket, connection_type: str = "general", message_format: str = "json"):
         """Accept a new WebSocket and classify by `connection_type`.
 
         Supports both fixed channels (app_logs, dryer_logs, dryers_stats)
@@ -45,6 +49,8 @@ class WebSocketConnectionManager:
         """
         await websocket.accept()
         self.active_connections.append(websocket)
+        if message_format != "json":
+            self.message_formats[websocket] = message_format
         
         # Fixed legacy channels
         if connection_type == "app_logs":
@@ -71,6 +77,7 @@ class WebSocketConnectionManager:
         if websocket in self.active_connections:
             self.active_connections.remove(websocket)
             removed = True
+        self.message_formats.pop(websocket, None)
             
         # Remove from fixed channels
         if websocket in self.app_logs_connections:
@@ -105,12 +112,15 @@ class WebSocketConnectionManager:
                 len(self.dynamic_channels)
             )
 
-    async def broadcast(self, message: str, connection_type: str = "all"):
+    async def broadcast(self, message: str, connection_type: str = "all",
+                        encoders: Optional[Dict[str, Callable[[], str]]] = None):
         """Send a text message to all or a specific connection type.
 
         Supports fixed channels (app_logs, dryer_logs, dryers_stats) and
         dynamic channels (dryer_{id}_stats). Broken connections encountered 
-        during send are removed via `disconnect`.
+        during send are removed via `disconnect`. `encoders` build `message`
+        in other formats for connections that negotiated one; each is called
+        at most once.
         """
         if connection_type == "all":
             targets = list(self.active_connections)
@@ -129,9 +139,16 @@ class WebSocketConnectionManager:
             return
 
         dead_connections = []
+        encoded: Dict[str, str] = {}
         for ws in targets:
+            text = message
+            message_format = self.message_formats.get(ws)
+            if message_format and encoders and message_format in encoders:
+                if message_format not in encoded:
+                    encoded[message_format] = encoders[message_format]()
+                text = encoded[message_format]
             try:
-                await ws.send_text(message)
+                await ws.send_text(text)
             except Exception as exc:  # noqa: BLE001 broad here to ensure cleanup
                 logger.debug("Dropping dead WebSocket during broadcast channel=%s: %s", connection_type, exc)
                 dead_connections.append(ws)
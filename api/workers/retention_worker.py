@@ -0,0 +1,128 @@
+"""Background telemetry retention.
+
+Every RETENTION_INTERVAL seconds raw logs and each rollup resolution older
+than their retention window are deleted in chunks of RETENTION_CHUNK_SIZE
+rows. Each chunk is its own short transaction picked through an index, with
+a RETENTION_CHUNK_PAUSE pause in between, so the telemetry writer and the
+control loop never wait long for the SQLite write lock.
+
+Retention windows (days, 0 = keep forever):
+* RETENTION_RAW_DAYS (default 3) - raw dryer_logs rows
+* RETENTION_1M_DAYS (default 90) - 1-minute rollups
+* RETENTION_15M_DAYS (default 365) - 15-minute rollups
+* RETENTION_1H_DAYS (default 0) - hourly rollups
+"""
+
+import asyncio
+import os
+from datetime import datetime, timedelta
+from api.logger import get_logger
+from api.database import get_db
+from api.cruds.common_crud import common_crud
+from api.cruds.rollup_crud import rollup_crud
+
+logger = get_logger("retention_worker")
+
+RETENTION_INTERVAL = float(os.getenv("RETENTION_INTERVAL", "3600"))
+RETENTION_CHUNK_SIZE = int(os.getenv("RETENTION_CHUNK_SIZE", "500"))
+RETENTION_CHUNK_PAUSE = float(os.getenv("RETENTION_CHUNK_PAUSE", "0.1"))
+# target -> retention in days; "raw" or a rollup resolution in seconds
+RETENTION_DAYS = {
+    "raw": float(os.getenv("RETENTION_RAW_DAYS", "3")),
+    60: float(os.getenv("RETENTION_1M_DAYS", "90")),
+    900: float(os.getenv("RETENTION_15M_DAYS", "365")),
+    3600: float(os.getenv("RETENTION_1H_DAYS", "0")),
+}
+
+
+class RetentionWorker:
+    """Periodic chunked purge of telemetry past its retention window."""
+
+    def __init__(self):
+        self.task: asyncio.Task | None = None
+        self.running = False
+        self.runs = 0
+        self.chunks = 0
+        self.deleted: dict = {target: 0 for target in RETENTION_DAYS}
+        self.last_run_at: datetime | None = None
+        self.last_run_duration = 0.0
+        self.chunk_max = 0.0
+
+    async def start(self):
+        if self.running:
+            logger.warning("Retention worker already running")
+            return
+        if not any(RETENTION_DAYS.values()):
+            logger.info("Retention disabled (all retention windows are 0)")
+            return
+        self.running = True
+        self.task = asyncio.create_task(self._run())
+        logger.info("Retention worker started windows=%s interval=%ss chunk=%s", RETENTION_DAYS, RETENTION_INTERVAL, RETENTION_CHUNK_SIZE)
+
+    async def stop(self):
+        if not self.running:
+            return
+        self.running = False
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        logger.info("Retention worker stopped deleted=%s", self.deleted)
+
+    async def _run(self):
+        while self.running:
+            try:
+                await self.purge()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Retention run failed error=%s", e)
+            await asyncio.sleep(RETENTION_INTERVAL)
+
+    async def purge(self) -> dict:
+        """Run one retention pass over every target; returns rows deleted per target."""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        now = datetime.utcnow()
+        deleted = {}
+        for target, days in RETENTION_DAYS.items():
+            if days <= 0:
+                continue
+            cutoff = now - timedelta(days=days)
+            deleted[target] = 0
+            while True:
+                chunk_started = loop.time()
+                async for session in get_db():
+                    if target == "raw":
+                        count = await common_crud.delete_logs_before(session, cutoff, RETENTION_CHUNK_SIZE)
+                    else:
+                        count = await rollup_crud.delete_before(session, target, cutoff, RETENTION_CHUNK_SIZE)
+                self.chunk_max = max(self.chunk_max, loop.time() - chunk_started)
+                self.chunks += 1
+                deleted[target] += count
+                if count < RETENTION_CHUNK_SIZE:
+                    break
+                await asyncio.sleep(RETENTION_CHUNK_PAUSE)
+            self.deleted[target] += deleted[target]
+        self.runs += 1
+        self.last_run_at = now
+        self.last_run_duration = loop.time() - started
+        logger.info("Retention pass deleted=%s duration=%.2fs", deleted, self.last_run_duration)
+        return deleted
+
+    def stats(self) -> dict:
+        """Retention windows and purge counters (seconds for durations)."""
+        return {
+            "running": self.running,
+            "retention_days": {str(target): days for target, days in RETENTION_DAYS.items()},
+            "runs": self.runs,
+            "chunks": self.chunks,
+            "deleted": {str(target): count for target, count in self.deleted.items()},
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_run_duration": round(self.last_run_duration, 3),
+            "chunk_max": round(self.chunk_max, 6),
+        }
+
+
+retentionWorker = RetentionWorker()
@@ -3,27 +3,48 @@
 Periodically:
 * Loads dryers from DB
 * Reconciles runtime instances with DB state (adds / removes)
-* Updates each dryer (batched Moonraker status queries inside dryer control)
+* Queries Moonraker once per host for all dryers (attribute selectors keep
+  the payload small) and hands each dryer its slice of the response
+* Skips dryers whose adaptive polling cadence says they are not due yet
+  (see `Dryer_control.poll_interval`)
+* Updates all due dryers concurrently (bounded by STATUS_WORKER_CONCURRENCY); a
+  dryer whose update exceeds DRYER_UPDATE_DEADLINE seconds is flagged and left
+  out of that tick's broadcast instead of stalling the others. Its tick is
+  never cancelled (a half-applied tick could leave actuators out of step with
+  the state machine); the dryer is skipped until it finishes
 * Broadcasts aggregated log JSON over the 'dryers_stats' WebSocket channel
 
-Timing: The loop attempts roughly 1 Hz cadence (sleep adjusted for processing
-time). Errors trigger a brief backoff and a safety heater shutdown.
+Timing: Ticks are paced by a fixed-rate `TickScheduler` on the event loop's
+monotonic clock (STATUS_TICK_PERIOD seconds, default 1). Overrunning ticks are
+handled per STATUS_TICK_OVERRUN ("skip" or "catch_up"). Errors trigger a
+safety heater shutdown; the next tick waits for its regular deadline.
 """
 
 import asyncio
+import os
+import time
 from api.logger import get_logger
+from api.config import STATUS_TICK_PERIOD, DRYER_UPDATE_DEADLINE
 from api.database import get_db
-from api.tools.moonraker_api import Moonraker_api
+from api.tools.moonraker_api import Moonraker_api, slice_status
 from fastapi import FastAPI, HTTPException
 from api.cruds.common_crud import common_crud
+from api.cruds.config_cache import config_cache
 from sqlalchemy.ext.asyncio import AsyncSession
 from api.tools.dryer_control import Dryer_control
+from api.workers.tick_scheduler import TickScheduler
+from api.workers.telemetry_writer import telemetryWriter
+from api.workers.retention_worker import retentionWorker
 import traceback
-from datetime import datetime
 from api.websocket_manager import webSocketManager
+from api.tools.columnar import columnar_frame
+from api.tools.telemetry_record import Telemetry_record, json_frame
 
 logger = get_logger("status_worker")
 
+STATUS_WORKER_CONCURRENCY = int(os.getenv("STATUS_WORKER_CONCURRENCY", "4"))
+STATUS_TICK_OVERRUN = os.getenv("STATUS_TICK_OVERRUN", "skip").lower()
+
 
 class StatusWorker:
     """Periodic background process maintaining dryer runtime state and telemetry."""
@@ -33,66 +54,164 @@ class StatusWorker:
         self.task: asyncio.Task | None = None
         self.running = False
         self.app: FastAPI | None = None
+        self.scheduler = TickScheduler(STATUS_TICK_PERIOD, STATUS_TICK_OVERRUN)
+
+    def stats(self) -> dict:
+        """Tick timing of the control loop plus config cache, telemetry writer and retention counters."""
+        return {
+            "running": self.running,
+            "tick": self.scheduler.stats(),
+            "config_cache": config_cache.stats(),
+            "telemetry": telemetryWriter.stats(),
+            "retention": retentionWorker.stats(),
+        }
 
     async def worker(self):
         """Main loop fetching DB dryers, syncing instances, updating status, broadcasting logs."""
+        self.scheduler.reset()
         while self.running:
             if not self.app:
                 logger.warning("Worker running without app reference; sleeping")
                 await asyncio.sleep(1)
                 continue
+            await self.scheduler.wait()
             self.db = get_db()
-            start_time = datetime.utcnow()
-            update_result: list[str] = []
+            update_result: list[Telemetry_record] = []
             try:
                 async for session in self.db:
-                    db_dryers = await common_crud.get_units(session)
+                    db_dryers = await common_crud.get_units_cached(session)
                     # Remove runtime dryers missing from DB
                     for dryer in list(self.app.state.dryer_instances):
                         if not any(e.id == dryer.id for e in db_dryers):
                             await self._delete_Dryer(dryer.id)
                     # Ensure runtime instances exist for all DB dryers
+                    dryers: list[Dryer_control] = []
                     for db_dryer in db_dryers:
                         try:
                             dryer = next(e for e in self.app.state.dryer_instances if e.id == db_dryer.id)
                         except StopIteration:
                             dryer = await self._add_Dryer(db_dryer.id)
-                        try:
-                            update_result.append(await dryer.update_status())
-                        except HTTPException:
-                            logger.error("Dryer missing during update dryer_id=%s", db_dryer.id)
+                        dryers.append(dryer)
+                    # Half a tick of tolerance keeps slow cadences on the tick grid
+                    now = time.monotonic() + self.scheduler.period / 2
+                    dryers = [dryer for dryer in dryers if dryer.is_due(now) and not self._is_busy(dryer)]
+                    statuses = await self._query_status(dryers)
+                    update_result = await self._update_dryers(dryers, statuses)
                 if update_result:
-                    update_result_str = ','.join(update_result)
-                    aggregated_json = f'[{update_result_str}]'
-                    
-                    # Broadcast to legacy /dryers endpoint (all dryers)
-                    await webSocketManager.broadcast(aggregated_json, 'dryers_stats')
+                    # Broadcast to legacy /dryers endpoint (all dryers); every frame
+                    # reuses each record's cached JSON
+                    await webSocketManager.broadcast(json_frame(update_result), 'dryers_stats', {
+                        'columnar': lambda: columnar_frame([record.log for record in update_result])
+                    })
                     
                     # Broadcast individual updates to dryer-specific channels
-                    for log_json in update_result:
+                    for record in update_result:
                         try:
-                            import json
-                            log_data = json.loads(log_json)
-                            dryer_id = log_data.get('dryer_id')
-                            if dryer_id:
-                                # Send to dryer-specific WebSocket channel
-                                await webSocketManager.broadcast(
-                                    f'[{log_json}]', 
-                                    f'dryer_{dryer_id}_stats'
-                                )
+                            await webSocketManager.broadcast(
+                                f'[{record.json}]', 
+                                f'dryer_{record.dryer_id}_stats',
+                                {'columnar': lambda record=record: columnar_frame([record.log])}
+                            )
                         except Exception as e:
-                            logger.warning("Failed to parse/broadcast individual log: %s", e)
-                            
-                end_time = datetime.utcnow()
-                delta_time = end_time - start_time
-                # Aim for ~1 second loop time
-                if delta_time.seconds == 0:
-                    await asyncio.sleep((1_000_000 - delta_time.microseconds)/1_000_000)
+                            logger.warning("Failed to broadcast individual log: %s", e)
             except Exception as e:  # broad catch to keep loop alive
                 logger.error("Status loop error: %s", e)
                 logger.error("Traceback: %s", traceback.format_exc())
                 await self._on_data_error()
-                await asyncio.sleep(1)
+
+    async def _update_dryers(self, dryers: list[Dryer_control], statuses: dict[int, dict]) -> list[Telemetry_record]:
+        """Run update_status for all dryers concurrently; return records of those that finished.
+
+        Unexpected errors are re-raised after every dryer finished its tick so
+        the loop's fail-safe still applies.
+        """
+        semaphore = asyncio.Semaphore(STATUS_WORKER_CONCURRENCY)
+        results = await asyncio.gather(
+            *(self._update_dryer(dryer, statuses.get(dryer.id), semaphore) for dryer in dryers),
+            return_exceptions=True,
+        )
+        errors = [result for result in results if isinstance(result, BaseException)]
+        if errors:
+            raise errors[0]
+        return [result for result in results if result is not None]
+
+    async def _update_dryer(self, dryer: Dryer_control, external_data: dict | None, semaphore: asyncio.Semaphore) -> Telemetry_record | None:
+        """Update one dryer, waiting up to DRYER_UPDATE_DEADLINE; None when late or failed.
+
+        The tick runs as its own task behind `asyncio.shield`: missing the
+        deadline only stops waiting for it. The task keeps running to the end
+        of the tick (state machine, actuator writes, next poll scheduling)
+        and the dryer is skipped (`_is_busy`) until it has finished.
+        """
+        async with semaphore:
+            task = asyncio.create_task(dryer.update_status(external_data=external_data))
+            dryer.update_task = task
+            try:
+                result = await asyncio.wait_for(asyncio.shield(task), timeout=DRYER_UPDATE_DEADLINE)
+            except asyncio.TimeoutError:
+                dryer.deadline_missed = True
+                dryer.deadline_misses += 1
+                dryer.deadline_misses_total += 1
+                logger.warning(
+                    "Dryer update missed deadline dryer_id=%s deadline=%.1fs consecutive=%s (tick left running)",
+                    dryer.id, DRYER_UPDATE_DEADLINE, dryer.deadline_misses
+                )
+                task.add_done_callback(lambda task: self._on_late_update(dryer, task))
+                return None
+            except HTTPException as e:
+                logger.error("Dryer update failed dryer_id=%s error=%s", dryer.id, e.detail)
+                return None
+        if dryer.deadline_missed:
+            logger.info("Dryer update back within deadline dryer_id=%s missed=%s", dryer.id, dryer.deadline_misses)
+        dryer.deadline_missed = False
+        dryer.deadline_misses = 0
+        return result
+
+    def _is_busy(self, dryer: Dryer_control) -> bool:
+        """True while a tick of the dryer that missed its deadline is still running."""
+        if dryer.update_task is None or dryer.update_task.done():
+            return False
+        dryer.busy_skips += 1
+        logger.debug("Dryer still busy with a late tick, skipped dryer_id=%s", dryer.id)
+        return True
+
+    def _on_late_update(self, dryer: Dryer_control, task: asyncio.Task):
+        # Retrieve the outcome of a tick nobody awaits any more
+        if task.cancelled():
+            return
+        error = task.exception()
+        if error is not None:
+            logger.error("Late dryer update failed dryer_id=%s error=%s", dryer.id, getattr(error, "detail", error))
+        else:
+            logger.info("Late dryer update finished dryer_id=%s", dryer.id)
+
+    async def _query_status(self, dryers: list[Dryer_control]) -> dict[int, dict]:
+        """Fetch status for all dryers with one combined query per Moonraker host.
+
+        Hosts are queried concurrently, each within DRYER_UPDATE_DEADLINE.
+        Returns a mapping dryer_id -> sliced response. Dryers whose host query
+        failed are left out and fall back to querying on their own.
+        """
+        hosts: dict[str, list[Dryer_control]] = {}
+        for dryer in dryers:
+            hosts.setdefault(dryer.moonraker_api.url, []).append(dryer)
+        results = await asyncio.gather(*(self._query_host(url, host_dryers) for url, host_dryers in hosts.items()))
+        statuses: dict[int, dict] = {}
+        for host_statuses in results:
+            statuses.update(host_statuses)
+        return statuses
+
+    async def _query_host(self, url: str, host_dryers: list[Dryer_control]) -> dict[int, dict]:
+        objects = [name for dryer in host_dryers for name in dryer.status_objects()]
+        try:
+            result = await asyncio.wait_for(host_dryers[0].moonraker_api.query_objects(objects), timeout=DRYER_UPDATE_DEADLINE)
+        except HTTPException as e:
+            logger.warning("Combined status query failed url=%s dryers=%s error=%s", url, len(host_dryers), e.detail)
+            return {}
+        except asyncio.TimeoutError:
+            logger.warning("Combined status query missed deadline url=%s dryers=%s", url, len(host_dryers))
+            return {}
+        return {dryer.id: slice_status(result, dryer.status_objects()) for dryer in host_dryers}
 
     async def _add_Dryer(self, id: int):
         """Instantiate and initialize a runtime Dryer_control, register in app state."""
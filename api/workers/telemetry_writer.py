@@ -0,0 +1,237 @@
+"""Batched background writer for dryer telemetry.
+
+Control ticks hand their `DryerLog` to `telemetryWriter.submit()`, which
+assigns the row id in memory (seeded from MAX(id) at start) on a copy of the
+log, queues it and returns it right away as a `Telemetry_record` so the live WebSocket
+broadcast never waits for the database. A single task drains the bounded queue and bulk-inserts
+rows with one executemany INSERT / one commit per batch, written every
+TELEMETRY_BATCH_SIZE rows or TELEMETRY_FLUSH_MS milliseconds. If another writer took ids meanwhile (the
+batch hits a primary key conflict), the counter is re-seeded from MAX(id)
+and the batch retried with fresh ids instead of being dropped.
+
+Samples submitted with `persist=False` (change-only recording, see
+`api.tools.telemetry_recorder`) still get an id and travel through the queue,
+but only feed the rollups; no raw row is written for them.
+
+Backpressure: when the queue (TELEMETRY_QUEUE_SIZE) is full, `submit()` waits
+up to TELEMETRY_PUT_TIMEOUT seconds and then drops the record; both events
+are counted. `flush()` waits only for the records queued before the call
+(a sequence number over the FIFO queue, not an empty queue): it returns at
+once when those are already written, and concurrent callers share the one
+early batch write it asks for. Used before serving history from the
+database and on shutdown.
+"""
+
+import asyncio
+import os
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+from api.logger import get_logger
+from api.database import get_db
+from api.cruds.dryer_crud import dryer_crud
+from api.schemas import dryer_schema
+from api.tools.telemetry_record import Telemetry_record
+
+logger = get_logger("telemetry_writer")
+
+TELEMETRY_QUEUE_SIZE = int(os.getenv("TELEMETRY_QUEUE_SIZE", "1000"))
+TELEMETRY_BATCH_SIZE = int(os.getenv("TELEMETRY_BATCH_SIZE", "100"))
+TELEMETRY_FLUSH_MS = int(os.getenv("TELEMETRY_FLUSH_MS", "5000"))
+TELEMETRY_PUT_TIMEOUT = float(os.getenv("TELEMETRY_PUT_TIMEOUT", "1"))
+TELEMETRY_WRITE_ATTEMPTS = 3
+
+# Queue marker asking the writer to write its current batch immediately
+_FLUSH = None
+
+
+class TelemetryWriter:
+    """Bounded queue + single writer task bulk-inserting dryer_logs rows."""
+
+    def __init__(self):
+        self.queue: asyncio.Queue | None = None
+        self.task: asyncio.Task | None = None
+        self.running = False
+        self._next_id = 0
+        self.rows_written = 0
+        self.samples_rolled_up = 0
+        self.batches = 0
+        self.dropped = 0
+        self.backpressure_waits = 0
+        self.failed_batches = 0
+        self.id_reseeds = 0
+        self.queue_max_depth = 0
+        self.commit_last = 0.0
+        self.commit_max = 0.0
+        self._commit_total = 0.0
+        # Records queued / taken off the queue and written (or dropped); the queue is FIFO,
+        # so the records queued before a flush are the first `_queued` ones
+        self._queued = 0
+        self._done = 0
+        self._flush_pending = False
+        self._progress: asyncio.Condition | None = None
+
+    async def start(self):
+        """Seed the id counter from the table and start the writer task."""
+        if self.running:
+            logger.warning("Telemetry writer already running")
+            return
+        async for session in get_db():
+            self._next_id = await dryer_crud.get_max_log_id(session) + 1
+        self.queue = asyncio.Queue(maxsize=TELEMETRY_QUEUE_SIZE)
+        self._progress = asyncio.Condition()
+        self.running = True
+        self.task = asyncio.create_task(self._run())
+        logger.info(
+            "Telemetry writer started next_id=%s batch=%s flush_ms=%s queue=%s",
+            self._next_id, TELEMETRY_BATCH_SIZE, TELEMETRY_FLUSH_MS, TELEMETRY_QUEUE_SIZE
+        )
+
+    async def stop(self):
+        """Write everything still queued, then stop the writer task."""
+        if not self.running:
+            return
+        await self.flush()
+        self.running = False
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        logger.info("Telemetry writer stopped rows_written=%s dropped=%s", self.rows_written, self.dropped)
+
+    async def submit(self, log_data: dryer_schema.DryerLog, persist: bool = True) -> Telemetry_record:
+        """Queue a log row; returns its record (with its id) without waiting for the DB.
+
+        The id is set on a shallow copy (no re-validation), so the caller's log
+        is left untouched. `persist=False` only folds the sample into the rollups.
+        Without a running writer the row is inserted directly (one transaction).
+        """
+        if not self.running:
+            async for session in get_db():
+                stored = await dryer_crud.add_log(session, dryer_schema.DryerLogBase(**log_data.dict(exclude={"id"})))
+                return Telemetry_record(stored)
+        record = log_data.copy(update={"id": self._next_id})
+        self._next_id += 1
+        item = (record, persist)
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.backpressure_waits += 1
+            try:
+                await asyncio.wait_for(self.queue.put(item), timeout=TELEMETRY_PUT_TIMEOUT)
+            except asyncio.TimeoutError:
+                self.dropped += 1
+                logger.warning("Telemetry queue full, record dropped dryer_id=%s dropped_total=%s", record.dryer_id, self.dropped)
+                return Telemetry_record(record)
+        self._queued += 1
+        self.queue_max_depth = max(self.queue_max_depth, self.queue.qsize())
+        return Telemetry_record(record)
+
+    async def flush(self):
+        """Wait until the rows queued before this call are written (later ones are not awaited)."""
+        if not self.running:
+            return
+        target = self._queued
+        if self._done >= target:
+            return
+        # One marker at a time: concurrent flushes wait on the same early write
+        if not self._flush_pending:
+            try:
+                self.queue.put_nowait(_FLUSH)
+                self._flush_pending = True
+            except asyncio.QueueFull:
+                pass  # a full queue is written in full batches anyway
+        async with self._progress:
+            await self._progress.wait_for(lambda: self._done >= target)
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            item = await self.queue.get()
+            batch: list[tuple[dryer_schema.DryerLog, bool]] = [] if item is _FLUSH else [item]
+            deadline = loop.time() + TELEMETRY_FLUSH_MS / 1000
+            while item is not _FLUSH and len(batch) < TELEMETRY_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self.queue.get(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is not _FLUSH:
+                    batch.append(item)
+            if item is _FLUSH:
+                self._flush_pending = False
+            try:
+                await self._write(batch)
+            finally:
+                self._done += len(batch)
+                async with self._progress:
+                    self._progress.notify_all()
+
+    async def _write(self, batch: list[tuple[dryer_schema.DryerLog, bool]]):
+        if not batch:
+            return
+        samples = [record for record, _ in batch]
+        rows = [record for record, persist in batch if persist]
+        loop = asyncio.get_running_loop()
+        for attempt in range(1, TELEMETRY_WRITE_ATTEMPTS + 1):
+            started = loop.time()
+            try:
+                async for session in get_db():
+                    await dryer_crud.add_logs(session, rows, samples=samples)
+            except asyncio.CancelledError:
+                raise
+            except IntegrityError as e:
+                # Ids taken by another writer: continue after the stored MAX(id)
+                await self._reseed(samples)
+                logger.warning("Telemetry batch id conflict rows=%s attempt=%s next_id=%s error=%s",
+                               len(batch), attempt, self._next_id, e)
+                continue
+            except Exception as e:
+                logger.warning("Telemetry batch write failed rows=%s attempt=%s error=%s", len(batch), attempt, e)
+                await asyncio.sleep(attempt)
+                continue
+            self.commit_last = loop.time() - started
+            self.commit_max = max(self.commit_max, self.commit_last)
+            self._commit_total += self.commit_last
+            self.rows_written += len(rows)
+            self.samples_rolled_up += len(samples)
+            self.batches += 1
+            logger.debug("Telemetry batch written rows=%s samples=%s commit=%.4fs", len(rows), len(samples), self.commit_last)
+            return
+        self.failed_batches += 1
+        self.dropped += len(batch)
+        logger.error("Telemetry batch dropped after %s attempts rows=%s", TELEMETRY_WRITE_ATTEMPTS, len(batch))
+
+    async def _reseed(self, samples: list[dryer_schema.DryerLog]):
+        """Move the id counter past MAX(id) and give the batch fresh ids."""
+        async for session in get_db():
+            self._next_id = max(self._next_id, await dryer_crud.get_max_log_id(session) + 1)
+        for record in samples:
+            record.id = self._next_id
+            self._next_id += 1
+        self.id_reseeds += 1
+
+    def stats(self) -> dict:
+        """Queue / write counters (seconds for latencies)."""
+        return {
+            "running": self.running,
+            "queue_depth": self.queue.qsize() if self.queue else 0,
+            "queue_max_depth": self.queue_max_depth,
+            "queue_size": TELEMETRY_QUEUE_SIZE,
+            "rows_written": self.rows_written,
+            "samples_rolled_up": self.samples_rolled_up,
+            "batches": self.batches,
+            "mean_batch_rows": round(self.rows_written / self.batches, 2) if self.batches else 0.0,
+            "commit_last": round(self.commit_last, 6),
+            "commit_mean": round(self._commit_total / self.batches, 6) if self.batches else 0.0,
+            "commit_max": round(self.commit_max, 6),
+            "backpressure_waits": self.backpressure_waits,
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+            "id_reseeds": self.id_reseeds,
+        }
+
+
+telemetryWriter = TelemetryWriter()
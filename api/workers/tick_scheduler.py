@@ -0,0 +1,89 @@
+"""Fixed-rate tick scheduler for background loops.
+
+Deadlines are laid on a fixed grid (start + n * period) of the event loop's
+monotonic clock, so processing time does not accumulate as drift and
+wall-clock jumps have no effect. When a tick overruns past the next
+deadline the overrun policy decides what happens:
+
+* "skip": missed deadlines are dropped and the loop waits for the next one
+  still ahead on the grid.
+* "catch_up": missed ticks run back-to-back until the grid is reached again
+  (bounded by `max_catch_up`; beyond that the grid is re-anchored).
+
+Jitter (how late a tick started relative to its deadline) and overrun
+counters are kept for diagnostics.
+"""
+
+import asyncio
+from typing import Optional
+
+OVERRUN_POLICIES = ("skip", "catch_up")
+
+
+class TickScheduler:
+    """Paces a loop at a fixed period on `loop.time()`."""
+
+    def __init__(self, period: float, overrun_policy: str = "skip", max_catch_up: int = 5):
+        if period <= 0:
+            raise ValueError("Tick period must be positive")
+        if overrun_policy not in OVERRUN_POLICIES:
+            raise ValueError(f"Unknown overrun policy {overrun_policy!r}, expected one of {OVERRUN_POLICIES}")
+        self.period = period
+        self.overrun_policy = overrun_policy
+        self.max_catch_up = max_catch_up
+        self._deadline: Optional[float] = None
+        self._tick_start: Optional[float] = None
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.jitter_last = 0.0
+        self.jitter_max = 0.0
+        self._jitter_total = 0.0
+        self.duration_last = 0.0
+        self.duration_max = 0.0
+
+    def reset(self) -> None:
+        """Forget the grid; the next `wait()` returns at once and anchors a new one."""
+        self._deadline = None
+        self._tick_start = None
+
+    async def wait(self) -> None:
+        """Sleep until the next tick deadline according to the overrun policy."""
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self._tick_start is not None:
+            self.duration_last = now - self._tick_start
+            self.duration_max = max(self.duration_max, self.duration_last)
+        if self._deadline is None:
+            self._deadline = now
+        else:
+            self._deadline += self.period
+            if now > self._deadline:
+                self.overruns += 1
+                missed = int((now - self._deadline) // self.period)
+                if self.overrun_policy == "skip" or missed > self.max_catch_up:
+                    # Drop missed deadlines, wait for the next one ahead on the grid
+                    self.skipped += missed + 1
+                    self._deadline += (missed + 1) * self.period
+            if self._deadline > now:
+                await asyncio.sleep(self._deadline - now)
+        self._tick_start = loop.time()
+        self.jitter_last = max(0.0, self._tick_start - self._deadline)
+        self.jitter_max = max(self.jitter_max, self.jitter_last)
+        self._jitter_total += self.jitter_last
+        self.ticks += 1
+
+    def stats(self) -> dict:
+        """Timing counters (seconds) for diagnostics."""
+        return {
+            "period": self.period,
+            "overrun_policy": self.overrun_policy,
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "skipped": self.skipped,
+            "jitter_last": round(self.jitter_last, 6),
+            "jitter_mean": round(self._jitter_total / self.ticks, 6) if self.ticks else 0.0,
+            "jitter_max": round(self.jitter_max, 6),
+            "duration_last": round(self.duration_last, 6),
+            "duration_max": round(self.duration_max, 6),
+        }
@@ -8,7 +8,10 @@ from fastapi.responses import FileResponse
 import os
 from api.endpoints import router as api_router
 from api.workers.status_worker import statusWorker
+from api.workers.telemetry_writer import telemetryWriter
+from api.workers.retention_worker import retentionWorker
 from api.tools.dryer_control import Dryer_control
+from api.tools.moonraker_api import moonrakerSessionPool
 from api.cruds.common_crud import common_crud
 from api.database import get_db
 
@@ -37,10 +40,16 @@ async def lifespan(app: FastAPI):
         logger.info("Skipping startup log clear (CLEAR_LOGS_ON_STARTUP=%s)", CLEAR_LOGS_ON_STARTUP)
     # Seed baseline data (presets, moonraker config) if empty
     await seed_db()
+    await telemetryWriter.start()
+    await retentionWorker.start()
     await statusWorker.start(app)
     logger.info("Application started with migrations")
     yield
     await statusWorker.stop()
+    await retentionWorker.stop()
+    # Flush queued telemetry before the process exits
+    await telemetryWriter.stop()
+    await moonrakerSessionPool.close()
     logger.info("Application shutting down")
 
 app = FastAPI(
@@ -30,6 +30,21 @@ export interface DryerLog {
   current_preset_id?: number | null; // newly provided by backend WS
   // Added field from backend (seconds remaining in drying phase or null)
   time_left_drying?: number | null;
+  // Interval summary (TELEMETRY_PERSIST_INTERVAL > 0) / rollup bucket statistics
+  samples?: number | null;
+  temperature_min?: number | null;
+  temperature_max?: number | null;
+  temperature_mean?: number | null;
+  relative_humidity_min?: number | null;
+  relative_humidity_max?: number | null;
+  relative_humidity_mean?: number | null;
+  heater_temperature_min?: number | null;
+  heater_temperature_max?: number | null;
+  heater_temperature_mean?: number | null;
+  // Rollup buckets only
+  resolution?: number;
+  heater_duty?: number;
+  servo_open_fraction?: number;
   // Added derived field (not from backend) for faster filtering
   epoch_ms?: number;
 }
@@ -68,6 +83,99 @@ const TIME_RANGE_WINDOWS_MS: Record<Exclude<TimeRangeKey, 'all'>, number> = {
   '12h': 12 * 60 * 60 * 1000
 };
 
+// Per-dryer point budget sent as max_points (matches the chart POINT_LIMITS);
+// the backend answers long ranges from 1 min / 15 min / 1 h rollups and
+// LTTB-downsamples the history to the budget before sending it
+const HISTORY_POINT_BUDGET: Record<TimeRangeKey, number> = {
+  '5m': 400,
+  '10m': 600,
+  '1h': 1500,
+  '6h': 1100,
+  '12h': 950,
+  'all': 800
+};
+
+// History arrives as {history_chunk, seq, done} frames of this many logs, so
+// neither side holds one huge frame and live updates start right away
+const HISTORY_CHUNK_SIZE = 500;
+
+// Columnar frames (api/tools/columnar.py): one array per field, delta-encoded
+// epoch-ms timestamps and ids, fixed-point readings, bit-packed state
+interface ColumnarLogs {
+  n: number;
+  scale: number;
+  statuses: string[];
+  t: number[];
+  id: number[];
+  dryer_id: number[];
+  current_preset_id: (number | null)[];
+  time_left_drying: (number | null)[];
+  heater_temperature: number[];
+  temperature: number[];
+  absolute_humidity: number[];
+  relative_humidity: number[];
+  state: number[];
+  // Optional columns, present when some row of the block carries them
+  samples?: (number | null)[];
+  resolution?: (number | null)[];
+  fraction_scale?: number;
+  heater_duty?: (number | null)[];
+  servo_open_fraction?: (number | null)[];
+  [summary: string]: unknown;
+}
+
+// Fixed-point summary columns (value * scale, null when absent)
+const SUMMARY_FIELDS = [
+  'temperature_min', 'temperature_max', 'temperature_mean',
+  'relative_humidity_min', 'relative_humidity_max', 'relative_humidity_mean',
+  'heater_temperature_min', 'heater_temperature_max', 'heater_temperature_mean'
+] as const;
+
+function fromFixed(value: number | null | undefined, scale: number): number | null {
+  return value == null ? null : value / scale;
+}
+
+function decodeColumns(c: ColumnarLogs): DryerLog[] {
+  const logs: DryerLog[] = new Array(c.n);
+  let t = 0, id = 0;
+  for (let i = 0; i < c.n; i++) {
+    t += c.t[i];
+    id += c.id[i];
+    const state = c.state[i];
+    logs[i] = {
+      id,
+      dryer_id: c.dryer_id[i],
+      timestamp: new Date(t).toISOString(),
+      epoch_ms: t,
+      status: c.statuses[state >> 3],
+      heater_temperature: c.heater_temperature[i] / c.scale,
+      heater_is_on: (state & 1) !== 0,
+      heater_fan_is_run: (state & 2) !== 0,
+      temperature: c.temperature[i] / c.scale,
+      servo_is_open: (state & 4) !== 0,
+      absolute_humidity: c.absolute_humidity[i] / c.scale,
+      relative_humidity: c.relative_humidity[i] / c.scale,
+      current_preset_id: c.current_preset_id[i],
+      time_left_drying: c.time_left_drying[i]
+    };
+  }
+  if (c.samples) c.samples.forEach((v, i) => (logs[i].samples = v));
+  if (c.resolution) c.resolution.forEach((v, i) => { if (v != null) logs[i].resolution = v; });
+  for (const field of SUMMARY_FIELDS) {
+    const column = c[field] as (number | null)[] | undefined;
+    if (column) column.forEach((v, i) => (logs[i][field] = fromFixed(v, c.scale)));
+  }
+  const fractionScale = c.fraction_scale ?? 1;
+  if (c.heater_duty) c.heater_duty.forEach((v, i) => { if (v != null) logs[i].heater_duty = v / fractionScale; });
+  if (c.servo_open_fraction) c.servo_open_fraction.forEach((v, i) => { if (v != null) logs[i].servo_open_fraction = v / fractionScale; });
+  return logs;
+}
+
+// Row objects or a columnar block, depending on the negotiated format
+function toLogs(payload: DryerLog[] | ColumnarLogs): DryerLog[] {
+  return Array.isArray(payload) ? payload : decodeColumns(payload);
+}
+
 interface InternalState {
   dryers: DryerShort[];
   summaries: Map<number, DryerStateSummary>;
@@ -86,6 +194,7 @@ export class DashboardService implements OnDestroy {
   private shouldReconnect = false;    // Only true while logically connected
   private reconnectTimeout?: any;
   private unitsRefreshInterval?: any;
+  private historyClearedDryers = new Set<number>(); // dryers whose logs the current history stream already replaced
   private readonly UNITS_REFRESH_INTERVAL_MS = 15_000; // 15 seconds (more responsive syncing)
 
   private state: InternalState = {
@@ -384,6 +493,7 @@ export class DashboardService implements OnDestroy {
     let url: string;
     const timeRange = this.state.timeRange;
     let startTime: string | undefined;
+    const maxPoints = HISTORY_POINT_BUDGET[timeRange];
 
     // Calculate start_time based on current timeRange (for both single and all modes)
     if (timeRange !== 'all') {
@@ -398,6 +508,9 @@ export class DashboardService implements OnDestroy {
       const params = new URLSearchParams();
       if (startTime) params.set('start_time', startTime);
       if (logLimit !== undefined) params.set('limit', logLimit.toString());
+      if (maxPoints !== undefined) params.set('max_points', maxPoints.toString());
+      params.set('chunk_size', HISTORY_CHUNK_SIZE.toString());
+      params.set('format', 'columnar');
 
       url = `${baseUrl}?${params.toString()}`;
       this.logger.info('DashboardSvc', 'openWebSocket single mode', {
@@ -412,6 +525,9 @@ export class DashboardService implements OnDestroy {
       const params = new URLSearchParams();
       if (startTime) params.set('start_time', startTime);
       if (logLimit !== undefined) params.set('limit', logLimit.toString());
+      if (maxPoints !== undefined) params.set('max_points', maxPoints.toString());
+      params.set('chunk_size', HISTORY_CHUNK_SIZE.toString());
+      params.set('format', 'columnar');
 
       const queryString = params.toString();
       url = queryString ? `${baseUrl}?${queryString}` : baseUrl;
@@ -447,15 +563,24 @@ export class DashboardService implements OnDestroy {
     };
 
     this.ws.onmessage = (ev) => {
-      // Payload can be either {history:[...]} or an array '[{...},{...}]'
+      // Payload can be {history:[...]}, a {history_chunk:[...], seq, done} frame or an array '[{...},{...}]';
+      // with format=columnar the log lists are columnar blocks and live frames are {columns:{...}}
       this.zone.run(() => {
         try {
           const text = ev.data;
           const parsed = JSON.parse(text);
           if (parsed && parsed.history) {
             // Initial history load
-            const arr: DryerLog[] = parsed.history;
+            const arr: DryerLog[] = toLogs(parsed.history);
             this.ingestLogs(arr, true);
+          } else if (parsed && parsed.history_chunk) {
+            // Streamed history: each dryer's old logs are cleared by its first chunk
+            if (parsed.seq === 0) this.historyClearedDryers = new Set<number>();
+            const arr: DryerLog[] = toLogs(parsed.history_chunk);
+            this.ingestLogs(arr, true, this.historyClearedDryers);
+            if (parsed.done) this.logger.debug('DashboardSvc', 'history stream done', { chunks: parsed.seq + 1 });
+          } else if (parsed && parsed.columns) {
+            this.ingestLogs(decodeColumns(parsed.columns), false);
           } else if (Array.isArray(parsed)) {
             const arr: DryerLog[] = parsed;
             this.ingestLogs(arr, false);
@@ -498,7 +623,7 @@ export class DashboardService implements OnDestroy {
     }
   }
 
-  private ingestLogs(logs: DryerLog[], isHistory: boolean) {
+  private ingestLogs(logs: DryerLog[], isHistory: boolean, clearedDryers?: Set<number>) {
     if (!logs || logs.length === 0) return;
     const batchSize = logs.length;
     this.logger.debug('DashboardSvc', 'ingestLogs batch', { batchSize, isHistory });
@@ -511,6 +636,11 @@ export class DashboardService implements OnDestroy {
     if (isHistory && logs.length > 0) {
       const dryerIdsInBatch = new Set(logs.map(l => l.dryer_id));
       dryerIdsInBatch.forEach(dryerId => {
+        // Chunked history: only the first chunk of each dryer clears its logs
+        if (clearedDryers) {
+          if (clearedDryers.has(dryerId)) return;
+          clearedDryers.add(dryerId);
+        }
         const summary = this.state.summaries.get(dryerId);
         if (summary) {
           summary.logs = []; // Clear old logs when new history arrives